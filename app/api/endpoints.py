@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from app.common.config import EMAIL_COLLECTION_NAME, GIT_COLLECTION_NAME, TEAMS_COLLECTION_NAME
 from app.extractor.email_extractor import extract_email_content
 from app.extractor.github_activity_extractor import extract_record_from_commit_entry, extract_record_from_issue_entry, extract_record_from_pull_request_entry
@@ -13,10 +13,10 @@ from app.pipeline.github_pipeline import save_github_data
 from app.pipeline.teams_post_pipeline import save_teams_posts_data
 from app.rdb.repository import find_all_teams, find_all_users, find_all_team_members, find_all_git_info
 from app.rdb.client import get_db
-from app.common.statics_report import save_user_activities_to_rdb
-from fastapi import APIRouter, Request, Depends, Path
+from app.common.statics_report import get_team_weekly_statics, get_user_weekly_statics, save_user_activities_to_rdb
+from fastapi import APIRouter, Request, Depends, Path, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.test_data_functions import load_commits_from_json, load_emails_from_json, load_issues_from_json, load_posts_from_json, load_pull_requests_from_json
 from app.vectordb.client import flush_all_collections
@@ -113,6 +113,38 @@ def get_vector_user_activity(
     # return save_user_activities_to_rdb("2025-05-30", db)
     return save_user_activities_to_rdb(target_date, db)
 
+@router.get("/statistics/users/{week_start}", tags=["RDB 데이터"])
+def get_user_statistics(
+    week_start: date = Path(..., description="주간 통계 시작일 (YYYY-MM-DD, 통계 저장 시 기준 날짜)"),
+    user_id: Optional[int] = Query(None, description="특정 사용자만 조회"),
+    db: Session = Depends(get_db)
+):
+    """
+    저장된 사용자 주간 활동 통계를 반환합니다. (재계산 없음, 캐시 사용)
+    """
+    return get_user_weekly_statics(week_start, db, user_id)
+
+@router.get("/statistics/teams/{week_start}", tags=["RDB 데이터"])
+def get_team_statistics(
+    week_start: date = Path(..., description="주간 통계 시작일 (YYYY-MM-DD, 통계 저장 시 기준 날짜)"),
+    team_id: Optional[str] = Query(None, description="특정 팀만 조회"),
+    db: Session = Depends(get_db)
+):
+    """
+    저장된 팀 주간 활동 통계를 반환합니다. (재계산 없음, 캐시 사용)
+    """
+    return get_team_weekly_statics(week_start, db, team_id)
+
+@router.post("/statistics/{target_date}/recompute", tags=["RDB 데이터"])
+def recompute_statistics(
+    target_date: str = Path(..., description="기준 날짜 (YYYY-MM-DD 형식)"),
+    db: Session = Depends(get_db)
+):
+    """
+    주간 활동 통계를 다시 계산하여 RDB에 저장하고 조회 캐시를 비웁니다.
+    """
+    return save_user_activities_to_rdb(target_date, db)
+
 @router.get("/flush")
 def flush_collections(request: Request):
     return flush_all_collections()
@@ -1,23 +1,59 @@
+import asyncio
 from base64 import b64decode
-from datetime import datetime
+from contextlib import aclosing
+from datetime import datetime, time as dt_time, timedelta, timezone
 from sqlalchemy.orm import Session
 import time
 from typing import List, Optional, Tuple
 from cryptography.hazmat.primitives import serialization
 import httpx
 import jwt
-import requests
 from sqlalchemy.orm import Session
 from qdrant_client.http import models
 
-from app.client.utils import parse_last_page
+from app.client.http_cache import ConditionalRequestTransport, get_http_cache
+from app.client.rate_limit import RateLimitedTransport, governor
+from app.client.user_email_cache import UserEmailCache
+from app.client.utils import ConcurrencyLimitedTransport, iter_pages
 from app.common.utils import convert_utc_to_kst
 from app.schemas.github_activity import CommitEntry, IssueEntry, PullRequestEntry, ReadmeInfo
 from app.rdb.repository import find_all_teams
 from app.vectordb.client import get_qdrant_client
-from app.common.config import README_COLLECTION_NAME
+from app.common.config import GITHUB_HTTP_CACHE_ENABLED, GITHUB_HTTP2, GITHUB_MAX_CONNECTIONS, GITHUB_MAX_KEEPALIVE_CONNECTIONS, GITHUB_REQUEST_CONCURRENCY, GITHUB_TIMEOUT_SECONDS, README_COLLECTION_NAME
 
 BASE_URL = "https://api.github.com"
+KST = timezone(timedelta(hours=9))
+
+def get_kst_day_start_utc(date: datetime) -> str:
+    """
+    대상 날짜(KST)의 시작 시각을 GitHub API 파라미터용 UTC ISO 8601 문자열로 반환
+    """
+    day_start = datetime.combine(date.date(), dt_time.min, tzinfo=KST)
+    return day_start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def create_github_client() -> httpx.AsyncClient:
+    """
+    GitHub API 호출에 공유할 AsyncClient를 생성합니다.
+    배치 1회 동안 재사용하여 TLS 핸드셰이크와 커넥션 생성을 줄입니다. (HTTP/2, keep-alive)
+    동시에 진행되는 요청 수는 GITHUB_REQUEST_CONCURRENCY로 제한하고,
+    설치 토큰별 rate limit 예산에 맞춰 요청 속도를 조절합니다. (예산 대기는 동시 요청 슬롯을 점유하지 않음)
+    GET 응답은 ETag / Last-Modified로 캐시하여 변경이 없으면 304 응답으로 재사용합니다.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=GITHUB_HTTP2,
+        limits=httpx.Limits(
+            max_connections=GITHUB_MAX_CONNECTIONS,
+            max_keepalive_connections=GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    transport = RateLimitedTransport(ConcurrencyLimitedTransport(transport, GITHUB_REQUEST_CONCURRENCY), governor)
+    if GITHUB_HTTP_CACHE_ENABLED:
+        transport = ConditionalRequestTransport(transport, get_http_cache(), governor.scope_for)
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(GITHUB_TIMEOUT_SECONDS, connect=10.0),
+    )
 
 def load_private_key(private_key_path: str):
     """
@@ -45,14 +81,14 @@ def create_jwt_token(app_id: str, private_key) -> str:
     
     return token
 
-def get_installation_access_token(jwt_token: str, db: Session) -> list[str]:
+async def get_installation_access_token(jwt_token: str, db: Session, client: httpx.AsyncClient) -> list[str]:
     headers = {
         "Authorization": f"Bearer {jwt_token}",
         "Accept": "application/vnd.github+json"
     }
 
     # 설치된 앱 리스트 조회
-    response = requests.get("https://api.github.com/app/installations", headers=headers)
+    response = await client.get(f"{BASE_URL}/app/installations", headers=headers)
     response.raise_for_status()  # 오류 시 예외 발생
 
     installations = response.json()
@@ -64,14 +100,15 @@ def get_installation_access_token(jwt_token: str, db: Session) -> list[str]:
     access_tokens = []
 
     for installation_id in installation_ids:
-        access_token_url = f"https://api.github.com/app/installations/{installation_id}/access_tokens"
-        token_response = requests.post(access_token_url, headers=headers)
+        access_token_url = f"{BASE_URL}/app/installations/{installation_id}/access_tokens"
+        token_response = await client.post(access_token_url, headers=headers)
         token_response.raise_for_status()
 
         access_token = token_response.json().get("token")
         if not access_token:
             raise Exception("Failed to obtain installation access token.")
         
+        governor.register(access_token, f"installation-{installation_id}")
         access_tokens.append(access_token)
 
     return access_tokens
@@ -82,18 +119,15 @@ def get_headers(access_token: str):
         "Accept": "application/vnd.github+json"
     }
 
-async def fetch_repositories(access_token: str) -> List[Tuple[str, str]]:
+async def fetch_repositories(access_token: str, client: httpx.AsyncClient) -> List[Tuple[str, str]]:
     url = f"{BASE_URL}/installation/repositories"
+    repos = []
 
-    async with httpx.AsyncClient() as client:
-        res = await client.get(url, headers=get_headers(access_token))
-        res.raise_for_status()
+    async with aclosing(iter_pages(client, url, get_headers(access_token), {"per_page": 100}, items_key="repositories")) as pages:
+        async for items in pages:
+            repos.extend((repo["owner"]["login"], repo["name"]) for repo in items)
 
-        data = res.json()
-        return [
-            (repo["owner"]["login"], repo["name"])
-            for repo in data.get("repositories", [])
-        ]
+    return repos
 
 async def fetch_user_email(username: str, access_token: str, client: httpx.AsyncClient) -> Optional[str]:
     """
@@ -114,52 +148,86 @@ async def fetch_user_email(username: str, access_token: str, client: httpx.Async
     
     return None
 
+class UserEmailResolver:
+    """
+    GitHub 로그인 → 이메일 조회기. 배치 1회 동안 모든 설치/저장소가 하나를 공유합니다.
+
+    1. 실행 중 메모 (GitInfo의 git_id → git_email로 미리 채워 팀원은 API를 호출하지 않음)
+    2. 디스크 TTL 캐시 (공개 이메일이 확인된 사용자만 저장)
+    3. /users/{username} 조회 (여러 저장소에서 같은 사용자를 동시에 요청해도 한 번만 호출)
+    디스크 캐시 조회는 이벤트 루프 밖에서 실행하고, 저장은 모아 두었다가 flush에서 한 번에 기록합니다.
+    """
+
+    def __init__(self, seed: Optional[dict[str, Optional[str]]] = None, cache: Optional[UserEmailCache] = None):
+        self._memo: dict[str, Optional[str]] = dict(seed or {})
+        self._cache = cache
+        self._pending: dict[str, asyncio.Task] = {}
+        self.api_calls = 0
+
+    async def resolve(self, username: str, access_token: str, client: httpx.AsyncClient) -> Optional[str]:
+        if username in self._memo:
+            return self._memo[username]
+
+        if self._cache is not None:
+            email = await asyncio.to_thread(self._cache.get, username)
+            if email:
+                self._memo[username] = email
+                return email
+
+        task = self._pending.get(username)
+        if task is None:
+            self.api_calls += 1
+            task = asyncio.create_task(fetch_user_email(username, access_token, client))
+            self._pending[username] = task
+
+        email = await asyncio.shield(task)
+        self._pending.pop(username, None)
+
+        # 비공개 이메일(None)은 이번 실행에서만 기억 (다음 실행에서는 조건부 요청으로 확인)
+        self._memo[username] = email
+        if email and self._cache is not None:
+            self._cache.put(username, email)
+        return email
+
+    async def flush(self):
+        if self._cache is not None:
+            await asyncio.to_thread(self._cache.flush)
+
 async def fetch_all_branch_commits(
     owner: str,
     repo: str,
     access_token: str,
     git_email: dict[str, int],
     date: datetime,
+    client: httpx.AsyncClient,
     limit_per_branch: int = None
 ) -> List[CommitEntry]:
     branches_url = f"{BASE_URL}/repos/{owner}/{repo}/branches"
     commits = []
     seen_shas = set()
     target_date_kst = date.date()
+    # 커밋 목록의 since는 committer 날짜 기준. author 날짜는 committer 날짜보다 늦을 수 없으므로
+    # 대상일 시작 이후만 받아도 누락이 없음. (rebase 등으로 committer 날짜가 다음 날일 수 있어 until은 지정하지 않음)
+    since = get_kst_day_start_utc(date)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            res_branches = await client.get(branches_url, headers=get_headers(access_token))
-            res_branches.raise_for_status()
-            branches = res_branches.json()
-
-            for branch in branches:
-                branch_name = branch["name"]
-                commits_url = f"{BASE_URL}/repos/{owner}/{repo}/commits"
-                params = {
-                    "sha": branch_name,
-                    "per_page": 100,
-                    "page": 1
-                }
-
-                # 먼저 첫 페이지 요청
-                res = await client.get(commits_url, headers=get_headers(access_token), params=params)
-                res.raise_for_status()
-                commit_items = res.json()
-                link_header = res.headers.get("Link", "")
-                last_page = parse_last_page(link_header)
-
-                fetched = 0
-                for page in range(1, last_page + 1):
-                    if page != 1:
-                        params["page"] = page
-                        res = await client.get(commits_url, headers=get_headers(access_token), params=params)
-                        res.raise_for_status()
-                        commit_items = res.json()
-
-                    if not commit_items:
-                        break
-
+    try:
+        branches = []
+        async with aclosing(iter_pages(client, branches_url, get_headers(access_token), {"per_page": 100})) as pages:
+            async for items in pages:
+                branches.extend(items)
+
+        for branch in branches:
+            branch_name = branch["name"]
+            commits_url = f"{BASE_URL}/repos/{owner}/{repo}/commits"
+            params = {
+                "sha": branch_name,
+                "since": since,
+                "per_page": 100
+            }
+
+            fetched = 0
+            async with aclosing(iter_pages(client, commits_url, get_headers(access_token), params)) as pages:
+                async for commit_items in pages:
                     for item in commit_items:
                         sha = item["sha"]
                         if sha in seen_shas:
@@ -191,12 +259,12 @@ async def fetch_all_branch_commits(
                     if limit_per_branch and fetched >= limit_per_branch:
                         break
 
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
-            raise
-        except Exception as e:
-            print(f"Unexpected error occurred: {str(e)}")
-            raise
+    except httpx.HTTPStatusError as e:
+        print(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"Unexpected error occurred: {str(e)}")
+        raise
 
     return commits
 
@@ -207,34 +275,24 @@ async def fetch_pull_requests(
     access_token: str,
     git_email: dict[str, int],
     git_id: dict[str, int],
-    date: datetime
+    date: datetime,
+    client: httpx.AsyncClient,
+    email_resolver: Optional[UserEmailResolver] = None
 ) -> List[PullRequestEntry]:
     base_url = f"{BASE_URL}/repos/{owner}/{repo}/pulls"
     per_page = 100
     result = []
     target_date_kst = date.date()
+    if email_resolver is None:
+        email_resolver = UserEmailResolver()
 
     try:
-        async with httpx.AsyncClient() as client:
-            # 1. 첫 페이지 요청
-            params = {"state": "all", "per_page": per_page, "page": 1}
-            res = await client.get(base_url, headers=get_headers(access_token), params=params)
-            res.raise_for_status()
-            pull_requests = res.json()
-            link_header = res.headers.get("Link", "")
-            last_page = parse_last_page(link_header)
-
-            # 2. 페이지 반복
-            for page in range(1, last_page + 1):
-                if page != 1:
-                    params["page"] = page
-                    res = await client.get(base_url, headers=get_headers(access_token), params=params)
-                    res.raise_for_status()
-                    pull_requests = res.json()
-
-                if not pull_requests:
-                    break
+        # 생성일 내림차순으로 페이지를 받고, 대상일 이전 PR이 나오면 중단
+        params = {"state": "all", "sort": "created", "direction": "desc", "per_page": per_page}
 
+        async with aclosing(iter_pages(client, base_url, get_headers(access_token), params)) as pages:
+            async for pull_requests in pages:
+                reached_older = False
                 for pr in pull_requests:
                     username = pr["user"]["login"] if pr.get("user") else None
                     author_email = None
@@ -242,12 +300,15 @@ async def fetch_pull_requests(
                     pr_datetime_kst = convert_utc_to_kst(pr["created_at"])
                     pr_date_kst = pr_datetime_kst.date()
                     
+                    if pr_date_kst < target_date_kst:
+                        reached_older = True
+                        break
                     if pr_date_kst != target_date_kst:
                         continue
 
                     if username:
                         try:
-                            author_email = await fetch_user_email(username, access_token, client)
+                            author_email = await email_resolver.resolve(username, access_token, client)
                         except Exception:
                             author_email = None
 
@@ -266,6 +327,9 @@ async def fetch_pull_requests(
                         author=mapped_author or username
                     ))
 
+                if reached_older:
+                    break
+
         return result
 
     except httpx.HTTPStatusError as e:
@@ -282,39 +346,41 @@ async def fetch_issues(
     access_token: str,
     git_email: dict[str, int],
     git_id: dict[str, int],
-    date: datetime
+    date: datetime,
+    client: httpx.AsyncClient,
+    email_resolver: Optional[UserEmailResolver] = None
 ) -> List[IssueEntry]:
     base_url = f"{BASE_URL}/repos/{owner}/{repo}/issues"
     per_page = 100
     issues = []
     target_date_kst = date.date()
+    if email_resolver is None:
+        email_resolver = UserEmailResolver()
 
     try:
-        async with httpx.AsyncClient() as client:
-            # 첫 페이지 요청 및 Link 헤더에서 마지막 페이지 파악
-            params = {"state": "all", "per_page": per_page, "page": 1}
-            res = await client.get(base_url, headers=get_headers(access_token), params=params)
-            res.raise_for_status()
-            issue_batch = res.json()
-            link_header = res.headers.get("Link", "")
-            last_page = parse_last_page(link_header)
-
-            for page in range(1, last_page + 1):
-                if page != 1:
-                    params["page"] = page
-                    res = await client.get(base_url, headers=get_headers(access_token), params=params)
-                    res.raise_for_status()
-                    issue_batch = res.json()
-
-                if not issue_batch:
-                    break
-
+        # since(수정일 기준)로 대상일 이전에 마지막으로 수정된 이슈를 제외하고,
+        # 생성일 내림차순으로 받아 대상일 이전 이슈가 나오면 중단
+        params = {
+            "state": "all",
+            "since": get_kst_day_start_utc(date),
+            "sort": "created",
+            "direction": "desc",
+            "per_page": per_page
+        }
+
+        async with aclosing(iter_pages(client, base_url, get_headers(access_token), params)) as pages:
+            async for issue_batch in pages:
+                reached_older = False
                 for issue in issue_batch:
-                    if "pull_request" in issue:
-                        continue
-                    
                     issue_datetime_kst = convert_utc_to_kst(issue["created_at"])
                     issue_date_kst =issue_datetime_kst.date()
+
+                    if issue_date_kst < target_date_kst:
+                        reached_older = True
+                        break
+
+                    if "pull_request" in issue:
+                        continue
                     
                     if issue_date_kst != target_date_kst:
                         continue
@@ -324,7 +390,7 @@ async def fetch_issues(
 
                     if username:
                         try:
-                            author_email = await fetch_user_email(username, access_token, client)
+                            author_email = await email_resolver.resolve(username, access_token, client)
                         except Exception:
                             author_email = None
 
@@ -341,6 +407,9 @@ async def fetch_issues(
                         author=mapped_author or username
                     ))
 
+                if reached_older:
+                    break
+
         return issues
 
     except httpx.HTTPStatusError as e:
@@ -352,33 +421,32 @@ async def fetch_issues(
 
 
 
-async def fetch_readme(owner: str, repo: str, access_token: str) -> Optional[ReadmeInfo]:
+async def fetch_readme(owner: str, repo: str, access_token: str, client: httpx.AsyncClient) -> Optional[ReadmeInfo]:
     url = f"{BASE_URL}/repos/{owner}/{repo}/readme"
 
     try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, headers=get_headers(access_token))
-            if res.status_code == 404:
-                return None
-            res.raise_for_status()
-
-            data = res.json()
-            decoded = b64decode(data["content"]).decode("utf-8")
-            repo_name = f"{owner}/{repo}"
-            readme_hash = data.get("sha", "")
+        res = await client.get(url, headers=get_headers(access_token))
+        if res.status_code == 404:
+            return None
+        res.raise_for_status()
+
+        data = res.json()
+        decoded = b64decode(data["content"]).decode("utf-8")
+        repo_name = f"{owner}/{repo}"
+        readme_hash = data.get("sha", "")
         
-            if await get_sha_from_vector_db(repo_name) == readme_hash:
-                print(f"{repo_name}의 README 변경사항 없음. 저장 생략.")
-                return None
-            else: 
-                print(f"{repo_name}의 README 변경사항 있음. 저장 진행.")
-                return ReadmeInfo(
-                    repo_name=repo_name,
-                    content=decoded,
-                    html_url=data["html_url"],
-                    download_url=data.get("download_url"),
-                    readme_hash=readme_hash
-                )
+        if await get_sha_from_vector_db(repo_name) == readme_hash:
+            print(f"{repo_name}의 README 변경사항 없음. 저장 생략.")
+            return None
+        else: 
+            print(f"{repo_name}의 README 변경사항 있음. 저장 진행.")
+            return ReadmeInfo(
+                repo_name=repo_name,
+                content=decoded,
+                html_url=data["html_url"],
+                download_url=data.get("download_url"),
+                readme_hash=readme_hash
+            )
 
 
     except httpx.HTTPStatusError as e:
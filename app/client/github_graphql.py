@@ -0,0 +1,244 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+import httpx
+
+from app.client.github_client import BASE_URL, fetch_readme, get_headers, get_kst_day_start_utc, get_sha_from_vector_db
+from app.common.utils import convert_utc_to_kst
+from app.schemas.github_activity import CommitEntry, IssueEntry, PullRequestEntry, ReadmeInfo
+
+GRAPHQL_URL = f"{BASE_URL}/graphql"
+
+COMMIT_FIELDS = """
+fragment CommitFields on CommitHistoryConnection {
+  pageInfo { hasNextPage endCursor }
+  nodes {
+    oid
+    message
+    authoredDate
+    author { email }
+  }
+}
+"""
+
+# 저장소 1개의 하루치 활동을 한 번에 조회. 페이지가 남은 연결만 다음 요청에 포함 (@include)
+REPO_ACTIVITY_QUERY = """
+query($owner: String!, $repo: String!, $since: GitTimestamp!, $issueSince: DateTime!,
+      $refCursor: String, $prCursor: String, $issueCursor: String,
+      $withRefs: Boolean!, $withPrs: Boolean!, $withIssues: Boolean!, $withReadme: Boolean!) {
+  repository(owner: $owner, name: $repo) {
+    refs(refPrefix: "refs/heads/", first: 50, after: $refCursor) @include(if: $withRefs) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        target { ... on Commit { history(since: $since, first: 100) { ...CommitFields } } }
+      }
+    }
+    pullRequests(first: 50, after: $prCursor, orderBy: {field: CREATED_AT, direction: DESC}) @include(if: $withPrs) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        createdAt
+        state
+        author { login ... on User { email } }
+      }
+    }
+    issues(first: 50, after: $issueCursor, orderBy: {field: CREATED_AT, direction: DESC}, filterBy: {since: $issueSince}) @include(if: $withIssues) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        createdAt
+        state
+        author { login ... on User { email } }
+      }
+    }
+    readme: object(expression: "HEAD:README.md") @include(if: $withReadme) { ... on Blob { oid } }
+  }
+}
+""" + COMMIT_FIELDS
+
+# 커밋이 100개를 넘는 브랜치의 다음 페이지 조회
+BRANCH_HISTORY_QUERY = """
+query($owner: String!, $repo: String!, $branch: String!, $since: GitTimestamp!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    ref(qualifiedName: $branch) {
+      target { ... on Commit { history(since: $since, first: 100, after: $cursor) { ...CommitFields } } }
+    }
+  }
+}
+""" + COMMIT_FIELDS
+
+
+async def run_graphql_query(client: httpx.AsyncClient, access_token: str, query: str, variables: dict) -> dict:
+    res = await client.post(GRAPHQL_URL, headers=get_headers(access_token), json={"query": query, "variables": variables})
+    res.raise_for_status()
+    body = res.json()
+
+    if body.get("errors"):
+        messages = "; ".join(error.get("message", "") for error in body["errors"])
+        if not body.get("data"):
+            raise Exception(f"GraphQL query failed: {messages}")
+        print(f"GraphQL 부분 오류: {messages}")
+    return body["data"]
+
+
+def map_author(login: Optional[str], email: Optional[str], git_email: dict[str, int], git_id: dict[str, int]):
+    mapped_author = git_email.get(email or None, None)
+    if not mapped_author:
+        mapped_author = git_id.get(login, 0)
+    return mapped_author or login
+
+
+async def fetch_repo_activity_graphql(
+    owner: str,
+    repo: str,
+    access_token: str,
+    git_email: dict[str, int],
+    git_id: dict[str, int],
+    date: datetime,
+    client: httpx.AsyncClient
+) -> Tuple[List[CommitEntry], List[PullRequestEntry], List[IssueEntry], Optional[ReadmeInfo]]:
+    """
+    GraphQL로 저장소 1개의 대상일(KST) 커밋/PR/이슈와 README blob OID를 조회합니다.
+    REST 조회(fetch_all_branch_commits, fetch_pull_requests, fetch_issues, fetch_readme)와 같은 기준으로 걸러 같은 객체를 반환합니다.
+    작성자 이메일은 응답에 포함된 공개 이메일을 사용하므로 사용자별 조회가 없습니다.
+    """
+    repo_name = f"{owner}/{repo}"
+    target_date_kst = date.date()
+    since = get_kst_day_start_utc(date)
+
+    commits: List[CommitEntry] = []
+    pull_requests: List[PullRequestEntry] = []
+    issues: List[IssueEntry] = []
+    readme_oid = None
+    seen_shas = set()
+    branch_cursors: List[Tuple[str, str]] = []
+
+    def add_commits(history: dict):
+        for node in history["nodes"]:
+            sha = node["oid"]
+            if sha in seen_shas:
+                continue
+            seen_shas.add(sha)
+
+            commit_datetime_kst = convert_utc_to_kst(node["authoredDate"])
+            if commit_datetime_kst.date() != target_date_kst:
+                continue
+
+            author_email = node["author"]["email"] if node.get("author") else None
+            commits.append(CommitEntry(
+                repo=repo_name,
+                sha=sha,
+                message=node.get("message"),
+                date=commit_datetime_kst,
+                author=git_email.get(author_email, 0)
+            ))
+
+    variables = {
+        "owner": owner,
+        "repo": repo,
+        "since": since,
+        "issueSince": since,
+        "refCursor": None,
+        "prCursor": None,
+        "issueCursor": None,
+        "withRefs": True,
+        "withPrs": True,
+        "withIssues": True,
+        "withReadme": True,
+    }
+
+    while variables["withRefs"] or variables["withPrs"] or variables["withIssues"]:
+        repository = (await run_graphql_query(client, access_token, REPO_ACTIVITY_QUERY, variables))["repository"]
+        if repository is None:
+            raise Exception(f"{repo_name} 저장소를 찾을 수 없습니다.")
+
+        if variables["withReadme"]:
+            readme_oid = (repository.get("readme") or {}).get("oid")
+            variables["withReadme"] = False
+
+        if variables["withRefs"]:
+            refs = repository["refs"]
+            for ref in refs["nodes"]:
+                history = (ref.get("target") or {}).get("history")
+                if not history:
+                    continue
+                add_commits(history)
+                if history["pageInfo"]["hasNextPage"]:
+                    branch_cursors.append((f"refs/heads/{ref['name']}", history["pageInfo"]["endCursor"]))
+            variables["withRefs"] = refs["pageInfo"]["hasNextPage"]
+            variables["refCursor"] = refs["pageInfo"]["endCursor"]
+
+        if variables["withPrs"]:
+            connection = repository["pullRequests"]
+            reached_older = False
+            for pr in connection["nodes"]:
+                pr_datetime_kst = convert_utc_to_kst(pr["createdAt"])
+                pr_date_kst = pr_datetime_kst.date()
+                if pr_date_kst < target_date_kst:
+                    reached_older = True
+                    break
+                if pr_date_kst != target_date_kst:
+                    continue
+
+                author = pr.get("author") or {}
+                pull_requests.append(PullRequestEntry(
+                    repo=repo_name,
+                    number=pr["number"],
+                    title=pr.get("title"),
+                    content=pr.get("body"),
+                    created_at=pr_datetime_kst,
+                    # REST와 같은 값으로 맞춤 (MERGED → closed)
+                    state="open" if pr["state"] == "OPEN" else "closed",
+                    author=map_author(author.get("login"), author.get("email"), git_email, git_id)
+                ))
+            variables["withPrs"] = not reached_older and connection["pageInfo"]["hasNextPage"]
+            variables["prCursor"] = connection["pageInfo"]["endCursor"]
+
+        if variables["withIssues"]:
+            connection = repository["issues"]
+            reached_older = False
+            for issue in connection["nodes"]:
+                issue_date_kst = convert_utc_to_kst(issue["createdAt"]).date()
+                if issue_date_kst < target_date_kst:
+                    reached_older = True
+                    break
+                if issue_date_kst != target_date_kst:
+                    continue
+
+                author = issue.get("author") or {}
+                issues.append(IssueEntry(
+                    repo=repo_name,
+                    number=issue["number"],
+                    title=issue.get("title"),
+                    created_at=issue_date_kst,
+                    state=issue["state"].lower(),
+                    author=map_author(author.get("login"), author.get("email"), git_email, git_id)
+                ))
+            variables["withIssues"] = not reached_older and connection["pageInfo"]["hasNextPage"]
+            variables["issueCursor"] = connection["pageInfo"]["endCursor"]
+
+    # 커밋이 많은 브랜치는 브랜치별로 이어서 조회
+    for branch, cursor in branch_cursors:
+        while cursor:
+            data = await run_graphql_query(client, access_token, BRANCH_HISTORY_QUERY, {
+                "owner": owner, "repo": repo, "branch": branch, "since": since, "cursor": cursor
+            })
+            ref = data["repository"]["ref"]
+            history = (ref.get("target") or {}).get("history") if ref else None
+            if not history:
+                break
+            add_commits(history)
+            cursor = history["pageInfo"]["endCursor"] if history["pageInfo"]["hasNextPage"] else None
+
+    # README는 blob OID가 벡터 DB의 해시와 같으면 본문을 받지 않음
+    # 루트에 README.md가 없으면(README.rst 등) REST로 조회
+    readme = None
+    if readme_oid and await get_sha_from_vector_db(repo_name) == readme_oid:
+        print(f"{repo_name}의 README 변경사항 없음. 저장 생략.")
+    else:
+        readme = await fetch_readme(owner, repo, access_token, client)
+
+    return commits, pull_requests, issues, readme
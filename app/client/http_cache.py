@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Callable, Dict, Optional, Set
+import httpx
+
+from app.common.cache import SqliteCache, lazy_singleton
+from app.common.config import GITHUB_HTTP_CACHE_MAX_AGE_DAYS, GITHUB_HTTP_CACHE_PATH
+
+# 캐시된 본문은 이미 디코딩된 상태이므로 저장하지 않는 헤더
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# 실행 간에 거의 바뀌지 않아 304를 기대할 수 있는 경로만 캐시
+# (저장소 목록, 브랜치 목록, README, 사용자 프로필. since/sort가 붙는 날짜별 목록은 제외)
+CACHEABLE_PATHS = [
+    re.compile(r"^/installation/repositories$"),
+    re.compile(r"^/repos/[^/]+/[^/]+/branches$"),
+    re.compile(r"^/repos/[^/]+/[^/]+/readme$"),
+    re.compile(r"^/users/[^/]+$"),
+]
+
+# 쓰기를 모아서 한 번에 커밋하는 기준 건수
+FLUSH_SIZE = 50
+
+def is_cacheable(request: httpx.Request) -> bool:
+    return request.method == "GET" and any(pattern.match(request.url.path) for pattern in CACHEABLE_PATHS)
+
+
+class HttpResponseCache(SqliteCache):
+    """
+    GitHub GET 응답을 (토큰 범위, URL)을 키로 SQLite에 저장하는 조건부 요청 캐시.
+    ETag / Last-Modified를 저장해 두었다가 다음 요청에 If-None-Match / If-Modified-Since로 보내고,
+    304 응답이면 저장된 본문을 반환합니다. (304 응답은 GitHub rate limit에 포함되지 않음)
+    저장/사용 시각 갱신은 메모리에 모아 두었다가 flush에서 한 트랜잭션으로 기록합니다.
+    """
+
+    def __init__(self, path: str = GITHUB_HTTP_CACHE_PATH, max_age_days: int = GITHUB_HTTP_CACHE_MAX_AGE_DAYS):
+        super().__init__(path)
+        self._pending: Dict[str, tuple] = {}
+        self._touched: Set[str] = set()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        # 오래 사용되지 않은 항목 정리 (삭제된 저장소, 더 이상 조회하지 않는 사용자 등)
+        self._conn.execute("DELETE FROM responses WHERE last_used < ?", (time.time() - max_age_days * 86400,))
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(scope: str, url: str) -> str:
+        return hashlib.sha256(f"{scope} {url}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            if key in self._pending:
+                etag, last_modified, headers, body, _ = self._pending[key]
+                return etag, last_modified, headers, body
+            return self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+    def put(self, key: str, response: httpx.Response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        headers = [(name, value) for name, value in response.headers.items() if name.lower() not in _SKIPPED_HEADERS]
+        with self._lock:
+            self._pending[key] = (etag, last_modified, json.dumps(headers), response.content, time.time())
+
+    def touch(self, key: str):
+        with self._lock:
+            self._touched.add(key)
+
+    def needs_flush(self) -> bool:
+        return len(self._pending) + len(self._touched) >= FLUSH_SIZE
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, set()
+            if not pending and not touched:
+                return
+
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses (cache_key, etag, last_modified, headers, body, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, *row) for key, row in pending.items()],
+            )
+            self._conn.executemany(
+                "UPDATE responses SET last_used = ? WHERE cache_key = ?",
+                [(now, key) for key in touched - pending.keys()],
+            )
+            self._conn.commit()
+
+
+class ConditionalRequestTransport(httpx.AsyncBaseTransport):
+    """
+    캐시 대상 GET 요청(CACHEABLE_PATHS)에 캐시된 검증자(ETag / Last-Modified)를 붙이고, 304 응답을 캐시된 200 응답으로 바꿔 반환하는 transport.
+    디스크 쓰기는 FLUSH_SIZE건씩 모아 이벤트 루프 밖에서 기록하고, 클라이언트를 닫을 때 남은 쓰기를 기록합니다.
+    scope_for는 Authorization 헤더를 캐시 범위(설치 단위)로 변환합니다. 토큰은 매 실행마다 새로 발급되므로
+    토큰 값 대신 설치 단위로 묶어야 다음 실행에서도 캐시를 사용할 수 있습니다.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: HttpResponseCache, scope_for: Callable[[Optional[str]], str]):
+        self._transport = transport
+        self._cache = cache
+        self._scope_for = scope_for
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not is_cacheable(request):
+            return await self._transport.handle_async_request(request)
+
+        key = self._cache.make_key(self._scope_for(request.headers.get("Authorization")), str(request.url))
+        cached = self._cache.get(key)
+        if cached:
+            etag, last_modified, _, _ = cached
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = await self._transport.handle_async_request(request)
+
+        if response.status_code == 304 and cached:
+            await response.aclose()
+            self._cache.hits += 1
+            self._cache.touch(key)
+            await self._flush_if_needed()
+            _, _, headers, body = cached
+            return httpx.Response(200, headers=json.loads(headers), content=body, request=request)
+
+        self._cache.misses += 1
+        if response.status_code == 200:
+            await response.aread()
+            self._cache.put(key, response)
+            await self._flush_if_needed()
+        return response
+
+    async def _flush_if_needed(self):
+        if self._cache.needs_flush():
+            await asyncio.to_thread(self._cache.flush)
+
+    async def aclose(self):
+        await asyncio.to_thread(self._cache.flush)
+        await self._transport.aclose()
+
+
+get_http_cache = lazy_singleton(HttpResponseCache)
@@ -123,6 +123,7 @@ def fetch_replies_for_message(token: str, team_id: str, channel_id: str, message
             ]
 
             replies.append(ReplyEntry(
+                message_id=reply.get("id"),
                 author=author,
                 content=reply_content,
                 date=reply_date,
@@ -208,6 +209,7 @@ def fetch_channel_posts(token: str, team_id: str, channel_id: str, db: Session,
                     author = user_name.get(match.group(1), 0)
 
             posts.append(PostEntry(
+                message_id=item.get("id"),
                 author=author,
                 subject=subject,
                 summary=summary,
@@ -412,7 +414,8 @@ def fetch_user_inbox_emails(token: str, user_email: str, date: datetime) -> List
                 content=content,
                 date=date,
                 conversation_id=conversation_id,
-                attachment_list=attachment_list if attachment_list else None
+                attachment_list=attachment_list if attachment_list else None,
+                message_id=msg.get("id")
             )
             results.append(email_entry)
 
@@ -469,7 +472,8 @@ def fetch_user_sent_emails(token: str, user_email: str, date: datetime) -> List[
                 content=content,
                 date=date,
                 conversation_id=conversation_id,
-                attachment_list=attachment_list if attachment_list else None
+                attachment_list=attachment_list if attachment_list else None,
+                message_id=msg.get("id")
             )
             results.append(email_entry)
 
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, Optional, Tuple
+import httpx
+
+from app.common.config import (
+    GITHUB_RATE_LIMIT_LOW_WATERMARK,
+    GITHUB_RATE_LIMIT_MAX_RETRIES,
+    GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS,
+    GITHUB_SECONDARY_BACKOFF_SECONDS,
+)
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+class RateLimitBudget:
+    """
+    토큰(설치) 하나의 리소스별(core / graphql) GitHub API 요청 예산.
+    응답 헤더(X-RateLimit-*)로 남은 요청 수와 초기화 시각을 갱신하고, 요청을 보낼 때마다 로컬에서 1씩 차감합니다. (token bucket)
+    """
+
+    def __init__(self, label: str, resource: str):
+        self.label = label
+        self.resource = resource
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.blocked_until = 0.0
+        self.next_request_at = 0.0
+        self.secondary_hits = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+
+    def delay(self, now: float) -> float:
+        """
+        지금 요청을 보내기 전에 기다려야 하는 시간(초)
+        """
+        if self.blocked_until > now:
+            return self.blocked_until - now
+
+        if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            return 0.0
+
+        if self.remaining <= 0:
+            return self.reset_at - now
+
+        # 남은 요청이 적으면 초기화 시각까지 남은 요청을 균등하게 분배
+        if self.remaining < GITHUB_RATE_LIMIT_LOW_WATERMARK:
+            return max(0.0, self.next_request_at - now)
+
+        return 0.0
+
+    def consume(self, now: float):
+        if self.remaining is not None:
+            self.remaining -= 1
+            if self.reset_at and self.reset_at > now and 0 < self.remaining < GITHUB_RATE_LIMIT_LOW_WATERMARK:
+                self.next_request_at = now + (self.reset_at - now) / self.remaining
+
+    def update(self, response: httpx.Response, now: float):
+        headers = response.headers
+        limit = _parse_int(headers.get("X-RateLimit-Limit"))
+        remaining = _parse_int(headers.get("X-RateLimit-Remaining"))
+        reset_at = _parse_int(headers.get("X-RateLimit-Reset"))
+
+        # 다른 리소스(search 등)의 예산 헤더는 이 예산에 반영하지 않음
+        resource = headers.get("X-RateLimit-Resource")
+        if resource and resource != self.resource:
+            limit = remaining = reset_at = None
+
+        if limit is not None:
+            self.limit = limit
+        if reset_at is not None and (self.reset_at is None or reset_at > self.reset_at):
+            # 새 윈도우가 시작되면 헤더 값을 그대로 사용
+            self.reset_at = float(reset_at)
+            self.remaining = remaining
+        elif remaining is not None:
+            # 동시에 보낸 요청의 응답이 순서와 다르게 도착할 수 있으므로 더 작은 값을 유지
+            self.remaining = remaining if self.remaining is None else min(self.remaining, remaining)
+
+        if not is_rate_limited(response):
+            return
+
+        retry_after = _parse_int(headers.get("Retry-After"))
+        if retry_after is not None:
+            wait = retry_after
+        elif remaining == 0 and reset_at is not None:
+            wait = max(0.0, reset_at - now)
+        else:
+            # 2차 제한(secondary rate limit)에 헤더가 없으면 지수적으로 대기
+            self.secondary_hits += 1
+            wait = GITHUB_SECONDARY_BACKOFF_SECONDS * (2 ** (self.secondary_hits - 1))
+
+        self.blocked_until = max(self.blocked_until, now + wait)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at,
+            "secondary_hits": self.secondary_hits,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "retries": self.retries,
+        }
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """
+    403/429 응답 중 rate limit에 의한 것만 판별 (권한 오류 등의 403은 제외)
+    """
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0":
+        return True
+    try:
+        return "rate limit" in response.text.lower()
+    except httpx.ResponseNotRead:
+        return False
+
+
+def resource_for(request: httpx.Request) -> str:
+    """
+    요청이 사용하는 rate limit 리소스. GraphQL은 REST(core)와 별도의 포인트 예산을 가짐
+    """
+    return "graphql" if request.url.path.rstrip("/").endswith("/graphql") else "core"
+
+
+class RateLimitGovernor:
+    """
+    (Authorization 헤더(설치 토큰), 리소스)별로 요청 예산을 관리합니다.
+    예산 상태는 이벤트 루프 안에서만 읽고 쓰므로 별도의 잠금 없이 사용합니다.
+    """
+
+    def __init__(self):
+        self._budgets: Dict[Tuple[str, str], RateLimitBudget] = {}
+        self._labels: Dict[str, str] = {}
+
+    @staticmethod
+    def _key(authorization: Optional[str]) -> str:
+        return hashlib.sha256((authorization or "").encode("utf-8")).hexdigest()
+
+    def register(self, access_token: str, label: str):
+        """
+        설치 토큰에 지표용 이름(예: installation-1234)을 붙입니다.
+        """
+        key = self._key(f"Bearer {access_token}")
+        self._labels[key] = label
+        for (budget_key, resource), budget in self._budgets.items():
+            if budget_key == key:
+                budget.label = f"{label}/{resource}"
+
+    def scope_for(self, authorization: Optional[str]) -> str:
+        """
+        토큰이 속한 범위(등록된 설치 이름, 없으면 토큰 해시)를 반환합니다.
+        """
+        key = self._key(authorization)
+        if key in self._labels:
+            return self._labels[key]
+        return f"token-{key[:8]}" if authorization else "anonymous"
+
+    def budget_for(self, authorization: Optional[str], resource: str = "core") -> RateLimitBudget:
+        key = self._key(authorization)
+        budget = self._budgets.get((key, resource))
+        if budget is None:
+            budget = RateLimitBudget(label=f"{self.scope_for(authorization)}/{resource}", resource=resource)
+            self._budgets[(key, resource)] = budget
+        return budget
+
+    async def acquire(self, budget: RateLimitBudget):
+        while True:
+            now = time.time()
+            wait = budget.delay(now)
+            if wait <= 0:
+                budget.consume(now)
+                return
+            if wait > GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS:
+                raise RateLimitExceeded(budget.label, wait)
+            budget.throttled_seconds += wait
+            await asyncio.sleep(wait)
+
+    def stats(self) -> Dict[str, dict]:
+        return {budget.label: budget.snapshot() for budget in self._budgets.values()}
+
+
+class RateLimitExceeded(httpx.TransportError):
+    def __init__(self, label: str, wait: float):
+        super().__init__(f"{label}: GitHub API 요청 예산 소진 ({wait:.0f}초 후 재시도 가능)")
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    요청 전에 설치별 예산을 확인하여 속도를 조절하고, rate limit 응답(403/429)은 대기 후 재시도하는 transport.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, governor: "RateLimitGovernor", max_retries: int = GITHUB_RATE_LIMIT_MAX_RETRIES):
+        self._transport = transport
+        self._governor = governor
+        self._max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        budget = self._governor.budget_for(request.headers.get("Authorization"), resource_for(request))
+
+        for attempt in range(self._max_retries + 1):
+            await self._governor.acquire(budget)
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+            budget.update(response, time.time())
+
+            if not is_rate_limited(response) or attempt == self._max_retries:
+                if response.status_code < 400:
+                    budget.secondary_hits = 0
+                return response
+
+            budget.retries += 1
+            print(f"GitHub rate limit 응답({response.status_code}). {budget.label} 대기 후 재시도 ({attempt + 1}/{self._max_retries})")
+            await response.aclose()
+
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+governor = RateLimitGovernor()
+
+def get_rate_limit_stats() -> Dict[str, dict]:
+    return governor.stats()
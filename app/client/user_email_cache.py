@@ -0,0 +1,63 @@
+import time
+from typing import Dict, Optional
+
+from app.common.cache import SqliteCache, lazy_singleton
+from app.common.config import GITHUB_USER_EMAIL_CACHE_PATH, GITHUB_USER_EMAIL_TTL_DAYS
+
+
+class UserEmailCache(SqliteCache):
+    """
+    GitHub 로그인 → 공개 이메일을 SQLite에 저장하는 TTL 캐시.
+    ttl_days가 지난 항목은 조회되지 않으며, 캐시를 열 때 삭제합니다.
+    저장은 메모리에 모아 두었다가 flush에서 한 트랜잭션으로 기록합니다.
+    """
+
+    def __init__(self, path: str = GITHUB_USER_EMAIL_CACHE_PATH, ttl_days: int = GITHUB_USER_EMAIL_TTL_DAYS):
+        super().__init__(path)
+        self.ttl_seconds = ttl_days * 86400
+        self._pending: Dict[str, tuple] = {}
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_emails (
+                login TEXT PRIMARY KEY,
+                email TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("DELETE FROM user_emails WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+
+    def get(self, login: str) -> Optional[str]:
+        with self._lock:
+            if login in self._pending:
+                self.hits += 1
+                return self._pending[login][0]
+            row = self._conn.execute(
+                "SELECT email FROM user_emails WHERE login = ? AND fetched_at >= ?",
+                (login, time.time() - self.ttl_seconds),
+            ).fetchone()
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, login: str, email: str):
+        with self._lock:
+            self._pending[login] = (email, time.time())
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO user_emails (login, email, fetched_at) VALUES (?, ?, ?)",
+                [(login, email, fetched_at) for login, (email, fetched_at) in pending.items()],
+            )
+            self._conn.commit()
+
+
+get_user_email_cache = lazy_singleton(UserEmailCache)
@@ -1,4 +1,10 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Optional
 from urllib.parse import parse_qs, urlparse
+import httpx
+
+from app.common.config import GITHUB_PAGE_CONCURRENCY
 
 def parse_last_page(link_header: str) -> int:
     """
@@ -26,3 +32,79 @@ def parse_last_page(link_header: str) -> int:
                 last_page = int(page_vals[0])
 
     return last_page
+
+class ConcurrencyLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    동시에 진행 중인 요청 수를 제한하는 transport.
+    HTTP/2에서는 커넥션 하나로 여러 요청이 다중화되므로 커넥션 수 제한과 별도로 요청 수를 제한합니다.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrency: int):
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self._semaphore:
+            response = await self._transport.handle_async_request(request)
+            # 본문까지 받은 뒤 슬롯을 반환
+            await response.aread()
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+async def iter_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: Optional[dict] = None,
+    max_concurrency: int = GITHUB_PAGE_CONCURRENCY,
+    items_key: Optional[str] = None,
+) -> AsyncIterator[list]:
+    """
+    GitHub 목록 API의 페이지를 순서대로 반환합니다.
+    응답이 목록을 객체로 감싸는 경우(예: {"repositories": [...]}) items_key로 목록 필드를 지정합니다.
+    첫 페이지의 Link 헤더로 마지막 페이지를 알아낸 뒤, 다음 페이지들을 최대 max_concurrency개까지 미리 요청합니다.
+    전체 동시 요청 수는 클라이언트의 transport에서 제한합니다.
+    호출 측에서 반복을 멈추면(aclose) 아직 끝나지 않은 요청은 취소됩니다.
+
+        async with aclosing(iter_pages(client, url, headers, params)) as pages:
+            async for items in pages:
+                ...
+    """
+    params = dict(params or {})
+
+    def items_of(res: httpx.Response) -> list:
+        body = res.json()
+        return body.get(items_key, []) if items_key else body
+
+    async def fetch(page: int) -> list:
+        res = await client.get(url, headers=headers, params={**params, "page": page})
+        res.raise_for_status()
+        return items_of(res)
+
+    res = await client.get(url, headers=headers, params={**params, "page": 1})
+    res.raise_for_status()
+    first = items_of(res)
+    if not first:
+        return
+    yield first
+
+    last_page = parse_last_page(res.headers.get("Link", ""))
+    next_page = 2
+    pending: deque = deque()
+
+    try:
+        while pending or next_page <= last_page:
+            while next_page <= last_page and len(pending) < max_concurrency:
+                pending.append(asyncio.create_task(fetch(next_page)))
+                next_page += 1
+
+            items = await pending.popleft()
+            if not items:
+                return
+            yield items
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
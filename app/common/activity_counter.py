@@ -0,0 +1,103 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+from sqlalchemy.orm import Session
+
+from app.common.config import DOCS_COLLECTION_NAME, EMAIL_COLLECTION_NAME, GIT_COLLECTION_NAME, TEAMS_COLLECTION_NAME
+from app.rdb.repository import find_activity_counts, find_all_users, save_activity_events
+from app.vectordb.schema import BaseRecord
+
+# 이벤트 항목(category) -> 통계 결과의 (분류, 키). 항목 이름은 DailyUserActivity 컬럼과 같음
+CATEGORIES = {
+    "teams_post": ("teams", "post"),
+    "teams_reply": ("teams", "reply"),
+    "email_send": ("email", "sender"),
+    "email_receive": ("email", "receivers"),
+    "docs_docx": ("docs", "docx"),
+    "docs_xlsx": ("docs", "xlsx"),
+    "docs_pptx": ("docs", "pptx"),
+    "docs_etc": ("docs", "else"),
+    "git_pull_request": ("git", "pull_request"),
+    "git_commit": ("git", "commit"),
+    "git_issue": ("git", "issue"),
+}
+
+def _utc_date(value: datetime) -> date:
+    # VectorDB 기반 통계와 같이 UTC 기준 날짜로 집계
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
+
+def build_activity_events(collection_name: str, records: List[BaseRecord], user_emails: dict) -> List[dict]:
+    """
+    업로드한 레코드에서 (source_id, user_id, category, activity_date) 이벤트를 만듭니다.
+    VectorDB count 기반 통계와 같은 기준으로 항목을 분류합니다.
+    """
+    events = []
+
+    def add(record: BaseRecord, user_id: int, category: str, value: datetime):
+        events.append({
+            "source_id": record.id,
+            "user_id": user_id,
+            "category": category,
+            "activity_date": _utc_date(value),
+        })
+
+    for record in records:
+        metadata = record.metadata
+
+        if collection_name == TEAMS_COLLECTION_NAME:
+            add(record, metadata.author, f"teams_{metadata.type}", metadata.date)
+
+        elif collection_name == GIT_COLLECTION_NAME:
+            add(record, metadata.author, f"git_{metadata.type}", metadata.date)
+
+        elif collection_name == EMAIL_COLLECTION_NAME:
+            email = user_emails.get(metadata.author)
+            if email and metadata.sender == email:
+                add(record, metadata.author, "email_send", metadata.date)
+            if email and email in metadata.receivers:
+                add(record, metadata.author, "email_receive", metadata.date)
+
+        elif collection_name == DOCS_COLLECTION_NAME:
+            # 문서는 첫 청크만 한 건으로 집계
+            if metadata.chunk_id != 0:
+                continue
+            category = f"docs_{metadata.type}" if metadata.type in ("docx", "xlsx", "pptx") else "docs_etc"
+            for author in set(metadata.author):
+                add(record, author, category, metadata.last_modified)
+
+    return [event for event in events if event["category"] in CATEGORIES]
+
+def record_activity_events(collection_name: str, records: List[BaseRecord], db: Session):
+    if collection_name not in (TEAMS_COLLECTION_NAME, GIT_COLLECTION_NAME, EMAIL_COLLECTION_NAME, DOCS_COLLECTION_NAME):
+        return
+
+    user_emails = {}
+    if collection_name == EMAIL_COLLECTION_NAME:
+        user_emails = {user.id: user.email for user in find_all_users(db)}
+
+    save_activity_events(build_activity_events(collection_name, records, user_emails), db)
+
+def load_user_activities_from_counters(target_date: date, db: Session) -> list:
+    """
+    수집 시점에 기록한 활동 이벤트로 7일치 통계를 만듭니다.
+    load_user_activities_from_vector_db와 같은 형태의 결과를 반환합니다.
+    """
+    users = find_all_users(db)
+    counts = {
+        (user_id, activity_date, category): count
+        for user_id, activity_date, category, count in find_activity_counts(target_date, target_date + timedelta(days=6), db)
+    }
+
+    statics = []
+    for i in range(7):
+        curr_date = target_date + timedelta(days=i)
+        tmp = []
+        for user in users:
+            array = {"teams": {}, "email": {}, "docs": {}, "git": {}}
+            for category, (group, key) in CATEGORIES.items():
+                array[group][key] = counts.get((user.id, curr_date, category), 0)
+
+            tmp.append({"id": user.id, "day": i, "statics": array})
+        statics.append(tmp)
+    return statics
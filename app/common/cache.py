@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class TTLCache:
+    """
+    프로세스 내 TTL 캐시. 만료된 항목은 조회 시점에 다시 계산합니다.
+    cache_empty가 False이면 빈 결과는 저장하지 않고 다음 조회에서 다시 계산합니다.
+    """
+
+    def __init__(self, ttl_seconds: int, cache_empty: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.cache_empty = cache_empty
+        self._items: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > now:
+                return item[1]
+
+        value = loader()
+        if not value and not self.cache_empty:
+            return value
+
+        with self._lock:
+            self._items[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class SqliteCache:
+    """
+    SQLite 파일 캐시의 공통 부분. 디렉터리 생성, 연결(WAL), 잠금, 적중률 지표를 제공합니다.
+    연결은 여러 스레드에서 사용하므로 조회/저장은 _lock 안에서 수행합니다.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+
+def lazy_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    최초 호출 시에만 factory로 생성하고 이후에는 같은 인스턴스를 반환하는 함수를 만듭니다.
+    """
+    instance: Optional[T] = None
+    lock = threading.Lock()
+
+    def get() -> T:
+        nonlocal instance
+
+        if instance is None:
+            with lock:
+                if instance is None:
+                    instance = factory()
+        return instance
+
+    return get
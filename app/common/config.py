@@ -6,15 +6,143 @@ load_dotenv(override=True)
 GITHUB_APP_ID = os.getenv("GITHUB_APP_ID")
 GITHUB_PRIVATE_KEY_PATH = os.getenv("GITHUB_PRIVATE_KEY_PATH")
 
+# GitHub API HTTP 클라이언트 설정 (배치 1회당 하나의 커넥션 풀 공유)
+GITHUB_HTTP2 = os.getenv("GITHUB_HTTP2", "true").lower() == "true"
+GITHUB_TIMEOUT_SECONDS = float(os.getenv("GITHUB_TIMEOUT_SECONDS", "30"))
+GITHUB_MAX_CONNECTIONS = int(os.getenv("GITHUB_MAX_CONNECTIONS", "20"))
+GITHUB_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", "10"))
+# 목록 API 하나를 페이지 단위로 받을 때 미리 요청해 두는 최대 페이지 수
+GITHUB_PAGE_CONCURRENCY = int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4"))
+# 동시에 수집하는 저장소 수 / 전체 GitHub API 동시 요청 수
+GITHUB_REPO_CONCURRENCY = int(os.getenv("GITHUB_REPO_CONCURRENCY", "4"))
+GITHUB_REQUEST_CONCURRENCY = int(os.getenv("GITHUB_REQUEST_CONCURRENCY", "8"))
+# GitHub 활동 조회 방식: "rest" (커밋/PR/이슈/README를 REST로 각각 조회) / "graphql" (저장소당 GraphQL 쿼리 몇 번으로 일괄 조회)
+GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "rest").lower()
+# GitHub API rate limit 대응
+# 남은 요청 수가 LOW_WATERMARK 미만이면 초기화 시각까지 요청 간격을 균등하게 벌림
+GITHUB_RATE_LIMIT_LOW_WATERMARK = int(os.getenv("GITHUB_RATE_LIMIT_LOW_WATERMARK", "100"))
+# 403/429 rate limit 응답 시 재시도 횟수, 헤더가 없는 2차 제한의 첫 대기 시간(초, 이후 2배씩 증가)
+GITHUB_RATE_LIMIT_MAX_RETRIES = int(os.getenv("GITHUB_RATE_LIMIT_MAX_RETRIES", "3"))
+GITHUB_SECONDARY_BACKOFF_SECONDS = float(os.getenv("GITHUB_SECONDARY_BACKOFF_SECONDS", "60"))
+# 대기 시간이 이 값을 넘으면 기다리지 않고 해당 요청을 실패 처리
+GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS", "900"))
+# GitHub 조건부 요청(ETag / If-Modified-Since) 디스크 캐시. MAX_AGE_DAYS 동안 사용되지 않은 응답은 삭제
+GITHUB_HTTP_CACHE_ENABLED = os.getenv("GITHUB_HTTP_CACHE_ENABLED", "true").lower() == "true"
+GITHUB_HTTP_CACHE_PATH = os.getenv("GITHUB_HTTP_CACHE_PATH", ".cache/github_http_cache.sqlite3")
+GITHUB_HTTP_CACHE_MAX_AGE_DAYS = int(os.getenv("GITHUB_HTTP_CACHE_MAX_AGE_DAYS", "30"))
+# GitHub 로그인 → 공개 이메일 디스크 캐시 유지 기간(일)
+GITHUB_USER_EMAIL_CACHE_PATH = os.getenv("GITHUB_USER_EMAIL_CACHE_PATH", ".cache/github_user_emails.sqlite3")
+GITHUB_USER_EMAIL_TTL_DAYS = int(os.getenv("GITHUB_USER_EMAIL_TTL_DAYS", "7"))
+
 MICROSOFT_CLIENT_ID = os.getenv("MICROSOFT_CLIENT_ID")
 MICROSOFT_CLIENT_SECRET = os.getenv("MICROSOFT_CLIENT_SECRET")
 MICROSOFT_TENANT_ID = os.getenv("MICROSOFT_TENANT_ID")
 
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE")  # 미설정 시 sentence-transformers 기본값 사용
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# 멀티 프로세스 인코딩: 워커 수가 2 이상이고 텍스트 수가 임계값 이상일 때만 사용
+# 워커당 torch 스레드는 cpu_count // 워커 수로 제한됨 (OMP_NUM_THREADS / MKL_NUM_THREADS가 설정되어 있으면 그 값 사용)
+# 워커를 늘리면 문서 단위 병렬성은 늘지만 워커당 행렬 연산 스레드는 줄어듦. 대량 인코딩에서 in-process encode보다 빠른지 측정 후 설정
+EMBEDDING_POOL_WORKERS = int(os.getenv("EMBEDDING_POOL_WORKERS", "1"))
+EMBEDDING_POOL_THRESHOLD = int(os.getenv("EMBEDDING_POOL_THRESHOLD", "2000"))
+
+# 임베딩 디스크 캐시 (주간 flush 이후 변경 없는 텍스트 재임베딩 방지)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embedding_cache.sqlite3")
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "1024"))
+
+# Qdrant 업로드 설정
+QDRANT_UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+QDRANT_UPSERT_PARALLELISM = int(os.getenv("QDRANT_UPSERT_PARALLELISM", "1"))
+QDRANT_UPSERT_MAX_RETRIES = int(os.getenv("QDRANT_UPSERT_MAX_RETRIES", "3"))
+
+# 수집과 임베딩/업로드를 겹쳐 실행할 때 대기할 수 있는 업로드 작업 수 (초과 시 수집 측이 대기)
+UPLOAD_QUEUE_SIZE = int(os.getenv("UPLOAD_QUEUE_SIZE", "4"))
 
 # Collection Name
 TEAMS_COLLECTION_NAME = "Teams-Posts"
 DOCS_COLLECTION_NAME = "Documents"
 GIT_COLLECTION_NAME = "Git-Activities"
 README_COLLECTION_NAME = "Git-Readme"
-EMAIL_COLLECTION_NAME = "Emails"
\ No newline at end of file
+EMAIL_COLLECTION_NAME = "Emails"
+
+# 토요일 정리 방식: "retention" (보존 기간이 지난 point만 삭제) / "flush" (컬렉션 전체 삭제)
+VECTORDB_CLEANUP_MODE = os.getenv("VECTORDB_CLEANUP_MODE", "retention")
+VECTORDB_RETENTION_DAYS = int(os.getenv("VECTORDB_RETENTION_DAYS", "14"))
+VECTORDB_DELETE_BATCH_SIZE = int(os.getenv("VECTORDB_DELETE_BATCH_SIZE", "1000"))
+
+# 주간 통계 집계 방식: "aggregate" (컬렉션별 scroll 1회 후 메모리 집계) / "count" (사용자·일자별 count 쿼리)
+# / "counter" (수집 시점에 RDB에 기록한 활동 이벤트 조회)
+STATICS_MODE = os.getenv("STATICS_MODE", "aggregate")
+# count 기반 비동기 집계 시 동시에 보내는 count 요청 수
+STATICS_COUNT_CONCURRENCY = int(os.getenv("STATICS_COUNT_CONCURRENCY", "16"))
+
+# 통계 조회 API 캐시 유지 시간(초). 스케줄러에서 재계산한 결과는 이 시간이 지나야 API에 반영됨
+STATICS_CACHE_TTL_SECONDS = int(os.getenv("STATICS_CACHE_TTL_SECONDS", "300"))
+
+# 컬렉션별 저장 프로파일
+# quantization: None 또는 "int8" (scalar quantization, 양자화 벡터는 RAM 유지)
+# on_disk_vectors / on_disk_payload: 원본 벡터 / payload를 디스크에 저장 (None이면 Qdrant 서버 기본값 유지)
+# hnsw: HNSW 인덱스 파라미터 (None이면 Qdrant 기본값)
+DEFAULT_STORAGE_PROFILE = {
+    "quantization": None,
+    "on_disk_vectors": None,
+    "on_disk_payload": None,
+    "hnsw": None,
+}
+
+COLLECTION_STORAGE_PROFILES = {
+    DOCS_COLLECTION_NAME: {
+        "quantization": "int8",
+        "on_disk_vectors": True,
+        "on_disk_payload": True,
+        "hnsw": {"m": 16, "ef_construct": 100, "on_disk": False},
+    },
+    EMAIL_COLLECTION_NAME: {
+        "quantization": "int8",
+        "on_disk_vectors": True,
+        "on_disk_payload": True,
+        "hnsw": {"m": 16, "ef_construct": 100, "on_disk": False},
+    },
+}
+
+# 보존 기간 판단에 사용하는 날짜 payload 필드 (README는 저장소별 최신 1건만 유지하므로 제외)
+COLLECTION_RETENTION_FIELDS = {
+    TEAMS_COLLECTION_NAME: "date",
+    EMAIL_COLLECTION_NAME: "date",
+    GIT_COLLECTION_NAME: "date",
+    DOCS_COLLECTION_NAME: "last_modified",
+}
+
+# 컬렉션별 payload 인덱스 스키마 (필드 이름 -> keyword / integer / datetime)
+# 통계 집계와 README 해시 조회에서 필터로 사용하는 필드들
+COLLECTION_PAYLOAD_INDEXES = {
+    TEAMS_COLLECTION_NAME: {
+        "author": "integer",
+        "date": "datetime",
+        "type": "keyword",
+    },
+    DOCS_COLLECTION_NAME: {
+        "author": "integer",
+        "last_modified": "datetime",
+        "type": "keyword",
+        "chunk_id": "integer",
+        "file_id": "keyword",
+    },
+    GIT_COLLECTION_NAME: {
+        "author": "integer",
+        "date": "datetime",
+        "type": "keyword",
+        "repo_name": "keyword",
+    },
+    README_COLLECTION_NAME: {
+        "repo_name": "keyword",
+    },
+    EMAIL_COLLECTION_NAME: {
+        "author": "integer",
+        "date": "datetime",
+        "sender": "keyword",
+        "receivers": "keyword",
+    },
+}
\ No newline at end of file
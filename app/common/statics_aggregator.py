@@ -0,0 +1,175 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterator, List
+import pandas as pd
+from qdrant_client import QdrantClient
+from qdrant_client.models import DatetimeRange, FieldCondition, Filter, MatchValue
+from sqlalchemy.orm import Session
+
+from app.common.config import DOCS_COLLECTION_NAME, EMAIL_COLLECTION_NAME, GIT_COLLECTION_NAME, TEAMS_COLLECTION_NAME
+from app.rdb.repository import find_all_users
+from app.rdb.schema import User
+from app.vectordb.client import get_qdrant_client
+
+SCROLL_PAGE_SIZE = 1000
+DAYS = 7
+
+# 통계 항목 (statics_report의 count 기반 결과와 같은 키 구성)
+TEAMS_TYPES = ["post", "reply"]
+EMAIL_TYPES = ["sender", "receivers"]
+DOCS_TYPES = ["docx", "xlsx", "pptx"]
+GIT_TYPES = ["pull_request", "commit", "issue"]
+
+def aggregate_user_activities_from_vector_db(target_date: date, db: Session) -> list:
+    """
+    7일치 사용자 활동 통계를 컬렉션별 scroll 한 번으로 집계합니다.
+    load_user_activities_from_vector_db와 같은 형태의 결과를 반환합니다.
+    """
+    client = get_qdrant_client()
+    users = find_all_users(db)
+
+    window_start = datetime.combine(target_date, time.min, tzinfo=timezone.utc)
+    start_str = f"{target_date}T00:00:00Z"
+    end_str = f"{target_date + timedelta(days=DAYS - 1)}T23:59:59Z"
+
+    teams = _count_by_type(
+        _load_frame(client, TEAMS_COLLECTION_NAME, ["author", "date", "type"], "date", start_str, end_str),
+        "date", window_start, TEAMS_TYPES,
+    )
+    email = _count_email(
+        _load_frame(client, EMAIL_COLLECTION_NAME, ["author", "date", "sender", "receivers"], "date", start_str, end_str),
+        window_start, users,
+    )
+    docs = _count_docs(
+        _load_frame(client, DOCS_COLLECTION_NAME, ["author", "last_modified", "type"], "last_modified", start_str, end_str,
+                    extra=[FieldCondition(key="chunk_id", match=MatchValue(value=0))]),
+        window_start,
+    )
+    git = _count_by_type(
+        _load_frame(client, GIT_COLLECTION_NAME, ["author", "date", "type"], "date", start_str, end_str),
+        "date", window_start, GIT_TYPES,
+    )
+
+    statics = []
+    for i in range(DAYS):
+        tmp = []
+        for user in users:
+            key = (user.id, i)
+            tmp.append({
+                "id": user.id,
+                "day": i,
+                "statics": {
+                    "teams": _row(teams, key, TEAMS_TYPES),
+                    "email": _row(email, key, EMAIL_TYPES),
+                    "docs": _row(docs, key, DOCS_TYPES + ["else"]),
+                    "git": _row(git, key, GIT_TYPES),
+                },
+            })
+        statics.append(tmp)
+    return statics
+
+def _scroll_payloads(client: QdrantClient, collection_name: str, fields: List[str], scroll_filter: Filter) -> Iterator[dict]:
+    if not client.collection_exists(collection_name):
+        return
+
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=SCROLL_PAGE_SIZE,
+            offset=offset,
+            with_payload=fields,
+            with_vectors=False,
+        )
+        for point in points:
+            yield point.payload or {}
+        if offset is None:
+            return
+
+def _load_frame(
+    client: QdrantClient,
+    collection_name: str,
+    fields: List[str],
+    date_field: str,
+    start_str: str,
+    end_str: str,
+    extra: List[FieldCondition] = None,
+) -> pd.DataFrame:
+    scroll_filter = Filter(
+        must=[FieldCondition(key=date_field, range=DatetimeRange(gte=start_str, lte=end_str))] + (extra or [])
+    )
+    frame = pd.DataFrame(list(_scroll_payloads(client, collection_name, fields, scroll_filter)), columns=fields)
+    print(f"{collection_name}: {len(frame)}건 집계 대상")
+    return frame
+
+def _with_day(frame: pd.DataFrame, date_field: str, window_start: datetime) -> pd.DataFrame:
+    """
+    날짜 필드를 기준일로부터의 일 수(day)로 변환합니다.
+    count 기반 집계와 같이 UTC 기준 하루를 00:00:00 ~ 23:59:59 구간으로 봅니다.
+    """
+    timestamps = pd.to_datetime(frame[date_field], utc=True, format="ISO8601")
+    offset = timestamps - pd.Timestamp(window_start)
+    day = offset.dt.days
+    within_day = offset - pd.to_timedelta(day, unit="D")
+
+    frame = frame.assign(day=day)
+    return frame[(day >= 0) & (day < DAYS) & (within_day <= pd.Timedelta(seconds=86399))]
+
+def _count_by_type(frame: pd.DataFrame, date_field: str, window_start: datetime, types: List[str]) -> Dict[tuple, dict]:
+    if frame.empty:
+        return {}
+
+    frame = _with_day(frame, date_field, window_start)
+    frame = frame[frame["type"].isin(types)]
+    if frame.empty:
+        return {}
+
+    counts = frame.groupby(["author", "day", "type"]).size().unstack("type", fill_value=0)
+    return _to_dict(counts)
+
+def _count_email(frame: pd.DataFrame, window_start: datetime, users: List[User]) -> Dict[tuple, dict]:
+    if frame.empty:
+        return {}
+
+    frame = _with_day(frame, "date", window_start)
+    if frame.empty:
+        return {}
+
+    user_email = pd.Series({user.id: user.email for user in users})
+    email = frame["author"].map(user_email)
+
+    receivers = frame["receivers"].apply(lambda value: value if isinstance(value, list) else [])
+    frame = frame.assign(
+        sender=(frame["sender"] == email).astype(int),
+        receivers=[addr in lst for addr, lst in zip(email, receivers)],
+    )
+    frame["receivers"] = frame["receivers"].astype(int)
+
+    counts = frame.groupby(["author", "day"])[EMAIL_TYPES].sum()
+    return _to_dict(counts)
+
+def _count_docs(frame: pd.DataFrame, window_start: datetime) -> Dict[tuple, dict]:
+    if frame.empty:
+        return {}
+
+    frame = _with_day(frame, "last_modified", window_start)
+    # 문서는 작성자가 여러 명이므로 작성자별로 펼쳐서 집계
+    frame = frame.explode("author").dropna(subset=["author"])
+    if frame.empty:
+        return {}
+
+    frame["author"] = frame["author"].astype(int)
+    frame["type"] = frame["type"].where(frame["type"].isin(DOCS_TYPES), "else")
+
+    counts = frame.groupby(["author", "day", "type"]).size().unstack("type", fill_value=0)
+    return _to_dict(counts)
+
+def _to_dict(counts: pd.DataFrame) -> Dict[tuple, dict]:
+    return {
+        (int(author), int(day)): {column: int(value) for column, value in row.items()}
+        for (author, day), row in counts.iterrows()
+    }
+
+def _row(counts: Dict[tuple, dict], key: tuple, columns: List[str]) -> dict:
+    values = counts.get(key, {})
+    return {column: values.get(column, 0) for column in columns}
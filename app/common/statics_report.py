@@ -1,19 +1,53 @@
+import asyncio
+import pandas as pd
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, date
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import Filter, FieldCondition, MatchValue, DatetimeRange
-from app.rdb.schema import DailyUserActivity, User, Weekday
-from app.rdb.repository import save_daily_user_activity, flush_daily_user_activity_if_exists, flush_team_activity_if_exists, find_all_users
-from app.common.config import TEAMS_COLLECTION_NAME, GIT_COLLECTION_NAME, EMAIL_COLLECTION_NAME, DOCS_COLLECTION_NAME
-from app.vectordb.client import get_qdrant_client
+from app.rdb.schema import User, Weekday
+from app.rdb.repository import replace_daily_activities, find_all_team_members, find_all_users, find_daily_team_activities, find_daily_user_activities
+from app.common.config import STATICS_CACHE_TTL_SECONDS, STATICS_COUNT_CONCURRENCY, STATICS_MODE, TEAMS_COLLECTION_NAME, GIT_COLLECTION_NAME, EMAIL_COLLECTION_NAME, DOCS_COLLECTION_NAME
+from app.vectordb.client import get_qdrant_client, open_async_qdrant_client
+from app.common.statics_aggregator import aggregate_user_activities_from_vector_db
+from app.common.activity_counter import load_user_activities_from_counters
+from app.common.cache import TTLCache
+
+# 주간 통계 조회 캐시: (week 시작일, "user"/"team", id) -> 결과
+# 프로세스마다 따로 유지되므로, 스케줄러(data_batch.py)의 금요일 재계산은 API 프로세스의 캐시를 비우지 못함.
+# 다른 프로세스에서는 TTL 만료가 유일한 갱신 수단이며, 배치 전 빈 주간이 고정되지 않도록 빈 결과는 캐시하지 않음
+statics_cache = TTLCache(STATICS_CACHE_TTL_SECONDS, cache_empty=False)
+
+def load_user_activities(target_date: date, db: Session) -> list:
+    if STATICS_MODE == "count":
+        return load_user_activities_from_vector_db(target_date, db)
+    if STATICS_MODE == "counter":
+        return load_user_activities_from_counters(target_date, db)
+    return aggregate_user_activities_from_vector_db(target_date, db)
 
 def save_user_activities_to_rdb(target_date: str, db: Session):
     date = datetime.strptime(target_date, "%Y-%m-%d").date()
-    data = load_user_activities_from_vector_db(date, db)
+    data = load_user_activities(date, db)
 
-    flush_daily_user_activity_if_exists(db)
-    flush_team_activity_if_exists(db)
+    store_user_activities(date, data, db)
 
+    return data
+
+async def save_user_activities_to_rdb_async(target_date: str, db: Session):
+    """
+    배치용 비동기 버전. count 방식은 count 쿼리를 동시에 실행합니다.
+    """
+    date = datetime.strptime(target_date, "%Y-%m-%d").date()
+    if STATICS_MODE == "count":
+        data = await load_user_activities_from_vector_db_async(date, db)
+    else:
+        data = load_user_activities(date, db)
+
+    store_user_activities(date, data, db)
+
+    return data
+
+def store_user_activities(date: date, data: list, db: Session):
+    rows = []
     for week in data:
         for day in week:
             user_id = day.get("id")
@@ -24,7 +58,7 @@ def save_user_activities_to_rdb(target_date: str, db: Session):
             docs = statics.get("docs")
             git = statics.get("git")
 
-            activity = DailyUserActivity(
+            rows.append(dict(
                 user_id=user_id,
                 report_date=date + timedelta(days=day.get("day")),
                 day=Weekday(day.get("day")),        # enum 사용
@@ -39,15 +73,93 @@ def save_user_activities_to_rdb(target_date: str, db: Session):
                 git_pull_request=git.get("pull_request"),
                 git_commit=git.get("commit"),
                 git_issue=git.get("issue")
-            )
-            
-            save_daily_user_activity(activity, db)
-
-    return data
+            ))
+
+    try:
+        team_rows = rollup_team_activities(rows, db)
+    except Exception as e:
+        # 팀 합산에 실패해도 사용자 통계는 저장 (팀 통계는 이전 데이터 유지)
+        print(f"팀 활동 통계 합산 실패: {e}")
+        team_rows = None
+
+    # 한 주 사용자/팀 데이터를 한 트랜잭션으로 교체
+    replace_daily_activities(rows, team_rows, db)
+    # 같은 프로세스(재계산 API)의 캐시만 비워짐
+    statics_cache.clear()
+
+def get_user_weekly_statics(week_start: date, db: Session, user_id: int = None) -> list:
+    """
+    RDB에 저장된 사용자 주간 통계를 조회합니다. 재계산하지 않으며 결과는 TTL 동안 캐시됩니다.
+    """
+    def load():
+        rows = find_daily_user_activities(week_start, week_start + timedelta(days=6), db, user_id)
+        return [_activity_to_dict(row, "user_id") for row in rows]
+
+    return statics_cache.get_or_set((week_start, "user", user_id), load)
+
+def get_team_weekly_statics(week_start: date, db: Session, team_id: str = None) -> list:
+    """
+    RDB에 저장된 팀 주간 통계를 조회합니다. 재계산하지 않으며 결과는 TTL 동안 캐시됩니다.
+    """
+    def load():
+        rows = find_daily_team_activities(week_start, week_start + timedelta(days=6), db, team_id)
+        return [_activity_to_dict(row, "team_id") for row in rows]
+
+    return statics_cache.get_or_set((week_start, "team", team_id), load)
+
+def _activity_to_dict(row, id_column: str) -> dict:
+    return {
+        id_column: getattr(row, id_column),
+        "report_date": row.report_date,
+        "day": int(row.day),
+        **{column: getattr(row, column) for column in ACTIVITY_COLUMNS},
+    }
+
+# DailyUserActivity / DailyTeamActivity 공통 집계 컬럼
+ACTIVITY_COLUMNS = [
+    "teams_post", "teams_reply",
+    "email_send", "email_receive",
+    "docs_docx", "docs_xlsx", "docs_pptx", "docs_etc",
+    "git_pull_request", "git_commit", "git_issue",
+]
+
+def rollup_team_activities(user_rows: list, db: Session) -> list:
+    """
+    사용자 일별 통계를 TeamMember 기준으로 팀 일별 통계로 합산합니다.
+    여러 팀에 속한 사용자는 각 팀에 모두 반영됩니다.
+    """
+    members = pd.DataFrame(
+        [(member.team_id, member.user_id) for member in find_all_team_members(db)],
+        columns=["team_id", "user_id"],
+    )
+    if not user_rows or members.empty:
+        return []
+
+    users = pd.DataFrame(user_rows)
+    users["day"] = users["day"].astype(int)
+
+    teams = (
+        users.merge(members, on="user_id")
+        .groupby(["team_id", "report_date", "day"], as_index=False)[ACTIVITY_COLUMNS]
+        .sum()
+    )
+
+    return [
+        {
+            "team_id": row["team_id"],
+            "report_date": row["report_date"],
+            "day": Weekday(int(row["day"])),
+            **{column: int(row[column]) for column in ACTIVITY_COLUMNS},
+        }
+        for row in teams.to_dict("records")
+    ]
 
 def load_user_activities_from_vector_db(target_date: date, db: Session) -> list:
     statics = []
 
+    client = get_qdrant_client()
+    users = find_all_users(db)
+
     for i in range(7):
         tmp = []
 
@@ -57,10 +169,6 @@ def load_user_activities_from_vector_db(target_date: date, db: Session) -> list:
         start_str = f"{curr_date}T00:00:00Z"
         end_str = f"{curr_date}T23:59:59Z"
 
-        client = get_qdrant_client()
-
-        users = find_all_users(db)
-
         for user in users:
             array = {}
             tmp_dict = {}
@@ -80,6 +188,167 @@ def load_user_activities_from_vector_db(target_date: date, db: Session) -> list:
     return statics
 
 
+async def load_user_activities_from_vector_db_async(
+    target_date: date,
+    db: Session,
+    concurrency: int = STATICS_COUNT_CONCURRENCY,
+) -> list:
+    """
+    load_user_activities_from_vector_db의 비동기 버전.
+    같은 count 쿼리를 AsyncQdrantClient로 동시에 실행하며, 동시 요청 수는 concurrency로 제한합니다.
+    클라이언트는 호출마다 열고 닫습니다. (배치 job마다 이벤트 루프가 새로 생기므로 공유하지 않음)
+    """
+    async with open_async_qdrant_client() as client:
+        return await _count_user_activities(client, target_date, db, concurrency)
+
+async def _count_user_activities(client: AsyncQdrantClient, target_date: date, db: Session, concurrency: int) -> list:
+    users = find_all_users(db)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def count(collection_name: str, count_filter: Filter) -> int:
+        async with semaphore:
+            result = await client.count(collection_name=collection_name, count_filter=count_filter, exact=True)
+            return result.count
+
+    async def report(user: User, i: int) -> dict:
+        curr_date = target_date + timedelta(days=i)
+        start_str = f"{curr_date}T00:00:00Z"
+        end_str = f"{curr_date}T23:59:59Z"
+
+        requests = activity_count_requests(user, start_str, end_str)
+        counts = await asyncio.gather(*(count(collection_name, count_filter) for _, _, collection_name, count_filter in requests))
+
+        array = {"teams": {}, "email": {}, "docs": {}, "git": {}}
+        for (group, key, _, _), value in zip(requests, counts):
+            array[group][key] = value
+        # 문서 기타 항목은 전체 문서 수에서 docx/xlsx/pptx를 뺀 값
+        array["docs"]["else"] = array["docs"].pop("all") - sum(array["docs"].values())
+
+        return {"id": user.id, "day": i, "statics": array}
+
+    statics = []
+    for i in range(7):
+        print(target_date + timedelta(days=i))
+        statics.append(list(await asyncio.gather(*(report(user, i) for user in users))))
+    return statics
+
+
+def activity_count_requests(user: User, start_str: str, end_str: str) -> list:
+    """
+    사용자 하루치 통계에 필요한 count 쿼리 목록 [(분류, 키, 컬렉션, 필터)]을 반환합니다.
+    """
+    requests = []
+
+    for metadata in ["post", "reply"]:
+        requests.append(("teams", metadata, TEAMS_COLLECTION_NAME, teams_filter(user, start_str, end_str, metadata)))
+    for metadata in ["sender", "receivers"]:
+        requests.append(("email", metadata, EMAIL_COLLECTION_NAME, email_filter(user, start_str, end_str, metadata)))
+    for metadata in ["docx", "xlsx", "pptx"]:
+        requests.append(("docs", metadata, DOCS_COLLECTION_NAME, docs_filter(user, start_str, end_str, metadata)))
+    requests.append(("docs", "all", DOCS_COLLECTION_NAME, docs_filter(user, start_str, end_str)))
+    for metadata in ["pull_request", "commit", "issue"]:
+        requests.append(("git", metadata, GIT_COLLECTION_NAME, git_filter(user, start_str, end_str, metadata)))
+
+    return requests
+
+
+def teams_filter(user: User, start_str: str, end_str: str, metadata: str) -> Filter:
+    return Filter(
+        must=[
+            FieldCondition(
+                key="author",
+                match=MatchValue(value=user.id)
+            ),
+            FieldCondition(
+                key="date",
+                range=DatetimeRange(
+                    gte=start_str,
+                    lte=end_str
+                )
+            ),
+            FieldCondition(
+                key="type",
+                match=MatchValue(value=metadata)
+            )
+        ]
+    )
+
+
+def email_filter(user: User, start_str: str, end_str: str, metadata: str) -> Filter:
+    return Filter(
+        must=[
+            FieldCondition(
+                key="author",
+                match=MatchValue(value=user.id)
+            ),
+            FieldCondition(
+                key="date",
+                range=DatetimeRange(
+                    gte=start_str,
+                    lte=end_str
+                )
+            ),
+            FieldCondition(
+                key=metadata,
+                match=MatchValue(value=user.email)
+            )
+        ]
+    )
+
+
+def docs_filter(user: User, start_str: str, end_str: str, metadata: str = None) -> Filter:
+    """
+    metadata(확장자)가 없으면 모든 형식의 문서를 대상으로 합니다.
+    """
+    must = [
+        FieldCondition(
+            key="author",
+            match=MatchValue(value=user.id)
+        ),
+        FieldCondition(
+            key="last_modified",
+            range=DatetimeRange(
+                gte=start_str,
+                lte=end_str
+            )
+        ),
+        FieldCondition(
+            key="chunk_id",
+            match=MatchValue(value=0)
+        )
+    ]
+    if metadata:
+        must.append(
+            FieldCondition(
+                key="type",
+                match=MatchValue(value=metadata)
+            )
+        )
+    return Filter(must=must)
+
+
+def git_filter(user: User, start_str: str, end_str: str, metadata: str) -> Filter:
+    return Filter(
+        must=[
+            FieldCondition(
+                key="author",
+                match=MatchValue(value=user.id)
+            ),
+            FieldCondition(
+                key="date",
+                range=DatetimeRange(
+                    gte=start_str,
+                    lte=end_str
+                )
+            ),
+            FieldCondition(
+                key="type",
+                match=MatchValue(value=metadata)
+            )
+        ]
+    )
+
+
 def teams_report(client: QdrantClient, user: User, start_str: str, end_str: str) -> dict:
     metadata_combinations = ["post", "reply"]
 
@@ -88,25 +357,7 @@ def teams_report(client: QdrantClient, user: User, start_str: str, end_str: str)
     for metadata in metadata_combinations:
         count = client.count(
                     collection_name=TEAMS_COLLECTION_NAME,
-                    count_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="author",
-                                match=MatchValue(value=user.id)
-                            ),
-                            FieldCondition(
-                                key="date",
-                                range=DatetimeRange(
-                                    gte=start_str,
-                                    lte=end_str
-                                )
-                            ),
-                            FieldCondition(
-                                key="type",
-                                match=MatchValue(value=metadata)
-                            )
-                        ]
-                    ),
+                    count_filter=teams_filter(user, start_str, end_str, metadata),
                     exact=True
                 )
         result[metadata] = count.count
@@ -122,25 +373,7 @@ def email_report(client: QdrantClient, user: User, start_str: str, end_str: str)
     for metadata in metadata_combinations:
         count = client.count(
                     collection_name=EMAIL_COLLECTION_NAME,
-                    count_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="author",
-                                match=MatchValue(value=user.id)
-                            ),
-                            FieldCondition(
-                                key="date",
-                                range=DatetimeRange(
-                                    gte=start_str,
-                                    lte=end_str
-                                )
-                            ),
-                            FieldCondition(
-                                key=metadata,
-                                match=MatchValue(value=user.email)
-                            )
-                        ]
-                    ),
+                    count_filter=email_filter(user, start_str, end_str, metadata),
                     exact=True
                 )
         result[metadata] = count.count
@@ -163,29 +396,7 @@ def docs_report(client: QdrantClient, user: User, start_str: str, end_str: str)
     for metadata in metadata_combinations:
         count = client.count(
                     collection_name=DOCS_COLLECTION_NAME,
-                    count_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="author",
-                                match=MatchValue(value=user.id)
-                            ),
-                            FieldCondition(
-                                key="last_modified",
-                                range=DatetimeRange(
-                                    gte=start_str,
-                                    lte=end_str
-                                )
-                            ),
-                            FieldCondition(
-                                key="type",
-                                match=MatchValue(value=metadata)
-                            ),
-                            FieldCondition(
-                                key="chunk_id",
-                                match=MatchValue(value=0)
-                            )
-                        ]
-                    ),
+                    count_filter=docs_filter(user, start_str, end_str, metadata),
                     exact=True
                 )
         
@@ -194,25 +405,7 @@ def docs_report(client: QdrantClient, user: User, start_str: str, end_str: str)
 
     count = client.count(
                     collection_name=DOCS_COLLECTION_NAME,
-                    count_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="author",
-                                match=MatchValue(value=user.id)
-                            ),
-                            FieldCondition(
-                                key="last_modified",
-                                range=DatetimeRange(
-                                    gte=start_str,
-                                    lte=end_str
-                                )
-                            ),
-                            FieldCondition(
-                                key="chunk_id",
-                                match=MatchValue(value=0)
-                            )
-                        ]
-                    ),
+                    count_filter=docs_filter(user, start_str, end_str),
                     exact=True
                 )
     
@@ -233,27 +426,9 @@ def git_report(client: QdrantClient, user: User, start_str: str, end_str: str) -
     for metadata in metadata_combinations:
         count = client.count(
                     collection_name=GIT_COLLECTION_NAME,
-                    count_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="author",
-                                match=MatchValue(value=user.id)
-                            ),
-                            FieldCondition(
-                                key="date",
-                                range=DatetimeRange(
-                                    gte=start_str,
-                                    lte=end_str
-                                )
-                            ),
-                            FieldCondition(
-                                key="type",
-                                match=MatchValue(value=metadata)
-                            )
-                        ]
-                    ),
+                    count_filter=git_filter(user, start_str, end_str, metadata),
                     exact=True
                 )
         result[metadata] = count.count
     
-    return result
\ No newline at end of file
+    return result
@@ -160,3 +160,13 @@ def get_git_emails_and_ids(db: Session):
         for info in git_info
         if info.git_id
     }
+
+def get_git_login_emails(db: Session) -> dict:
+    """
+    GitInfo에 등록된 GitHub 로그인 → 이메일 (이메일 미등록 사용자는 None)
+    """
+    return {
+        info.git_id: info.git_email
+        for info in find_all_git_info(db)
+        if info.git_id
+    }
@@ -1,7 +1,7 @@
 from typing import List, Optional
 from app.common.utils import extract_from_docx, extract_from_txt, extract_from_xlsx, split_into_chunks
 from app.schemas.docs_activity import DocsEntry
-from app.vectordb.schema import BaseRecord, DocumentMetadata
+from app.vectordb.schema import BaseRecord, DocumentMetadata, make_point_id
 
 def extract_file_content(docs_entry: DocsEntry, file_path: str) -> List[str]:
     
@@ -37,6 +37,7 @@ def create_record_from_entry(contents: List[str], entry: DocsEntry) -> List[Base
             continue  # 빈 청크는 무시
         
         records.append(BaseRecord[DocumentMetadata](
+            id=make_point_id("document", entry.file_id, idx),
             text=text,
             metadata=DocumentMetadata(
                 file_id=entry.file_id,
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from app.schemas.email_activity import EmailEntry
-from app.vectordb.schema import BaseRecord, EmailMetadata
+from app.vectordb.schema import BaseRecord, EmailMetadata, make_point_id
 from typing import List
 from app.common.utils import get_user_emails
 
@@ -12,7 +12,14 @@ def extract_email_content(email: EmailEntry, db: Session) -> BaseRecord[EmailMet
 
     print(user_info, email.author)
     
+    # 같은 메일이라도 메일함(author)마다 Graph 메시지 ID가 다르므로 author를 함께 키로 사용
+    if email.message_id:
+        point_id = make_point_id("email", email.author, email.message_id)
+    else:
+        point_id = make_point_id("email", email.author, email.sender, email.subject, email.date.isoformat())
+
     return BaseRecord[EmailMetadata](
+        id=point_id,
         text=combined_text,
         metadata=EmailMetadata(
             author=user_info.get(email.author, 0),
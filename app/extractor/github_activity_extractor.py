@@ -1,11 +1,12 @@
 from app.schemas.github_activity import CommitEntry, IssueEntry, PullRequestEntry, ReadmeInfo
-from app.vectordb.schema import BaseRecord, GitCommitMetadata, GitIssueMetadata, GitPRMetadata, GitReadMeMetadata
+from app.vectordb.schema import BaseRecord, GitCommitMetadata, GitIssueMetadata, GitPRMetadata, GitReadMeMetadata, make_point_id
 
 
 def extract_record_from_commit_entry(
     commit_entry: CommitEntry,
 ) -> BaseRecord[GitCommitMetadata]:
     return BaseRecord[GitCommitMetadata](
+        id=make_point_id("commit", commit_entry.repo, commit_entry.sha),
         text=(commit_entry.message or "").strip(),
         metadata=GitCommitMetadata(
             author=commit_entry.author or 0,
@@ -21,6 +22,7 @@ def extract_record_from_pull_request_entry(
     pr_entry: PullRequestEntry,
 ) -> BaseRecord[GitPRMetadata]:
     return BaseRecord[GitPRMetadata](
+        id=make_point_id("pull_request", pr_entry.repo, pr_entry.number),
         text=(pr_entry.content or "").strip(),
         metadata=GitPRMetadata(
             author=pr_entry.author or 0,
@@ -37,6 +39,7 @@ def extract_record_from_issue_entry(
     issue_entry: IssueEntry,
 ) -> BaseRecord[GitIssueMetadata]:
     return BaseRecord[GitIssueMetadata](
+        id=make_point_id("issue", issue_entry.repo, issue_entry.number),
         text=(issue_entry.title or "").strip(),
         metadata=GitIssueMetadata(
             author=issue_entry.author or 0,
@@ -52,6 +55,7 @@ def extract_record_from_readme(
     readme: ReadmeInfo,
 ) -> BaseRecord[GitReadMeMetadata]:
     return BaseRecord[GitReadMeMetadata](
+        id=make_point_id("readme", readme.repo_name),
         text=readme.content.strip(),
         metadata=GitReadMeMetadata(
             repo_name=readme.repo_name,
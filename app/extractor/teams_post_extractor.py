@@ -1,7 +1,7 @@
 from typing import List, Union
 from app.common.utils import clean_html
 from app.schemas.teams_post_activity import PostEntry, ReplyEntry
-from app.vectordb.schema import BaseRecord, TeamsPostMetadata
+from app.vectordb.schema import BaseRecord, TeamsPostMetadata, make_point_id
 import re
 
 def create_records_from_post_entry(team_post: PostEntry) -> List[BaseRecord[TeamsPostMetadata]]:
@@ -15,7 +15,8 @@ def create_records_from_post_entry(team_post: PostEntry) -> List[BaseRecord[Team
         reply_record = parse_post_data(
             data=reply,
             is_reply=True,
-            post_content=team_post.content
+            post_content=team_post.content,
+            parent_id=team_post.message_id
         )
 
         docs.append(reply_record)
@@ -25,7 +26,8 @@ def create_records_from_post_entry(team_post: PostEntry) -> List[BaseRecord[Team
 def parse_post_data(
     data: Union[PostEntry, ReplyEntry],
     is_reply: bool = False,
-    post_content: str = None
+    post_content: str = None,
+    parent_id: str = None
 ) -> BaseRecord[TeamsPostMetadata]:
     text_parts = []
 
@@ -60,7 +62,14 @@ def parse_post_data(
         date=data.date
     )
 
+    # Graph 메시지 ID는 채널 단위로만 고유하므로 작성 시각과 상위 게시물 ID를 함께 키로 사용
+    if data.message_id:
+        point_id = make_point_id(metadata.type, parent_id, data.message_id, data.date.isoformat())
+    else:
+        point_id = make_point_id(metadata.type, parent_id, data.author, data.date.isoformat(), combined_text)
+
     return BaseRecord[TeamsPostMetadata](
+        id=point_id,
         text=combined_text,
         metadata=metadata
     )
\ No newline at end of file
@@ -1,15 +1,22 @@
 from contextlib import asynccontextmanager
-from app.vectordb.client import get_qdrant_client
+from app.rdb.client import engine
+from app.rdb.repository import create_activity_event_table
+from app.vectordb.client import close_qdrant_client, get_qdrant_client
+from app.vectordb.embedding import get_embedding_model
 from fastapi import FastAPI
 from app.api import endpoints
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+  create_activity_event_table(engine)
   qdrant_client = get_qdrant_client()
   app.state.qdrant_client = qdrant_client
+  app.state.embedding_model = get_embedding_model()
 
   yield
 
+  close_qdrant_client()
+
 app = FastAPI(lifespan = lifespan)
 
 app.include_router(endpoints.router)
@@ -1,12 +1,15 @@
+import asyncio
 from datetime import datetime
 import os
 from sqlalchemy.orm import Session
 from typing import List
 from app.client.ms_graph_client import download_file_from_graph, fetch_all_sites, fetch_drive_files, get_access_token, get_drive_id
-from app.common.config import DOCS_COLLECTION_NAME, MICROSOFT_CLIENT_ID, MICROSOFT_CLIENT_SECRET, MICROSOFT_TENANT_ID
+from app.common.config import DOCS_COLLECTION_NAME, EMBEDDING_POOL_THRESHOLD, EMBEDDING_POOL_WORKERS, QDRANT_UPSERT_BATCH_SIZE, MICROSOFT_CLIENT_ID, MICROSOFT_CLIENT_SECRET, MICROSOFT_TENANT_ID
 from app.extractor.document_extractor import create_record_from_entry, extract_file_content
 from app.schemas.docs_activity import DocsEntry
-from app.vectordb.uploader import upload_data_to_db
+from app.vectordb.schema import BaseRecord, DocumentMetadata
+from app.vectordb.client import delete_stale_document_chunks
+from app.vectordb.upload_worker import UploadWorker
 from app.common.utils import get_user_emails
 
 async def save_docs_data(db: Session, date: datetime):
@@ -34,45 +37,61 @@ async def save_docs_data(db: Session, date: datetime):
             if not site_id:
                 continue
 
-            drive_id = get_drive_id(token, site_id)
+            drive_id = await asyncio.to_thread(get_drive_id, token, site_id)
             if not drive_id:
                 continue
 
-            docs = fetch_drive_files(access_token=token, drive_id=drive_id, user_info=user_info, date=date)
+            docs = await asyncio.to_thread(fetch_drive_files, access_token=token, drive_id=drive_id, user_info=user_info, date=date)
             all_docs.extend(docs)
 
         except Exception as e:
             print(f"[오류] 사이트 {site_name} 처리 중 오류 발생: {str(e)}")
             continue
     
-    records = []
+    # 다운로드/추출과 임베딩/업로드를 겹쳐 실행. 청크는 배치 크기만큼 모아서 넘김
+    # 멀티 프로세스 인코딩을 쓰는 경우 풀 임계값만큼 모아야 풀이 사용됨
+    flush_size = QDRANT_UPSERT_BATCH_SIZE
+    if EMBEDDING_POOL_WORKERS > 1:
+        flush_size = max(flush_size, EMBEDDING_POOL_THRESHOLD)
 
-    for doc in all_docs:
-        try:
-            file_path = download_file_from_graph(
-                drive_id=doc.drive_id,
-                file_id=doc.file_id,
-                filename=doc.filename,
-                access_token=token
-            )
-            content = extract_file_content(doc, file_path)
-        finally:
-            try:
-                os.remove(file_path)
-                os.rmdir(os.path.dirname(file_path))
-            except Exception:
-                pass
-        
-        if content is None:
-            content = ""  # 빈 문자열로 대체하거나 continue 할 수도 있음
-        
-        record_list = create_record_from_entry(content, doc)
-        records.extend(record_list)
-    
-    upload_data_to_db(collection_name=DOCS_COLLECTION_NAME, records=records)
+    async with UploadWorker(record_events=True) as uploader:
+        records = []
+
+        for doc in all_docs:
+            record_list = await asyncio.to_thread(load_doc_records, doc, token)
+            # 청크 수가 줄어든 문서의 이전 청크 정리 (이번 청크 ID는 남기므로 업로드 순서와 무관)
+            await asyncio.to_thread(delete_stale_document_chunks, doc.file_id, [record.id for record in record_list])
+            records.extend(record_list)
+
+            if len(records) >= flush_size:
+                await uploader.submit(DOCS_COLLECTION_NAME, records)
+                records = []
+
+        await uploader.submit(DOCS_COLLECTION_NAME, records)
         
     return all_docs
 
+def load_doc_records(doc: DocsEntry, token: str) -> List[BaseRecord[DocumentMetadata]]:
+    try:
+        file_path = download_file_from_graph(
+            drive_id=doc.drive_id,
+            file_id=doc.file_id,
+            filename=doc.filename,
+            access_token=token
+        )
+        content = extract_file_content(doc, file_path)
+    finally:
+        try:
+            os.remove(file_path)
+            os.rmdir(os.path.dirname(file_path))
+        except Exception:
+            pass
+    
+    if content is None:
+        content = ""  # 빈 문자열로 대체하거나 continue 할 수도 있음
+    
+    return create_record_from_entry(content, doc)
+
 
 
 
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from typing import List
 from sqlalchemy.orm import Session
@@ -5,7 +6,7 @@ from app.client.ms_graph_client import fetch_user_email_ids, fetch_user_inbox_em
 from app.extractor.email_extractor import extract_email_content
 from app.schemas.email_activity import EmailEntry
 from app.common.config import EMAIL_COLLECTION_NAME, MICROSOFT_CLIENT_ID, MICROSOFT_CLIENT_SECRET, MICROSOFT_TENANT_ID
-from app.vectordb.uploader import upload_data_to_db
+from app.vectordb.upload_worker import UploadWorker
 
 async def save_all_email_data(db: Session, date: datetime):
     # TODO: 오늘 날짜 데이터만 긁어올 수 있도록 수정
@@ -15,17 +16,18 @@ async def save_all_email_data(db: Session, date: datetime):
     
     all_users = fetch_user_email_ids(token)
     
-    for user in all_users:
-        print(f"[INFO] 사용자 '{user}'의 메일을 조회 중...")
+    # 사용자 단위로 임베딩/업로드를 넘기고, 그동안 다음 사용자의 메일을 조회
+    async with UploadWorker(record_events=True) as uploader:
+        for user in all_users:
+            print(f"[INFO] 사용자 '{user}'의 메일을 조회 중...")
 
-        inbox = fetch_user_inbox_emails(token, user, date)
-        sent = fetch_user_sent_emails(token, user, date)
+            inbox = await asyncio.to_thread(fetch_user_inbox_emails, token, user, date)
+            sent = await asyncio.to_thread(fetch_user_sent_emails, token, user, date)
 
-        all_emails.extend(inbox)
-        all_emails.extend(sent)
-    
-    records = [extract_email_content(email, db) for email in all_emails]
-    if records:
-        upload_data_to_db(collection_name=EMAIL_COLLECTION_NAME, records=records)
+            all_emails.extend(inbox)
+            all_emails.extend(sent)
+
+            records = [extract_email_content(email, db) for email in inbox + sent]
+            await uploader.submit(EMAIL_COLLECTION_NAME, records)
         
     return all_emails
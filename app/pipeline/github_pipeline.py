@@ -1,44 +1,70 @@
+import asyncio
 from datetime import datetime
+from typing import Optional
+import httpx
 from sqlalchemy.orm import Session
-from app.client.github_client import create_jwt_token, fetch_all_branch_commits, fetch_issues, fetch_pull_requests, fetch_readme, fetch_repositories, get_installation_access_token, load_private_key
+from app.client.github_client import UserEmailResolver, create_github_client, create_jwt_token, fetch_all_branch_commits, fetch_issues, fetch_pull_requests, fetch_readme, fetch_repositories, get_installation_access_token, load_private_key
+from app.client.github_graphql import fetch_repo_activity_graphql
+from app.client.http_cache import get_http_cache
+from app.client.rate_limit import get_rate_limit_stats
+from app.client.user_email_cache import get_user_email_cache
 from app.extractor.github_activity_extractor import extract_record_from_commit_entry, extract_record_from_issue_entry, extract_record_from_pull_request_entry, extract_record_from_readme
-from app.common.config import GIT_COLLECTION_NAME, GITHUB_APP_ID, GITHUB_PRIVATE_KEY_PATH, README_COLLECTION_NAME
+from app.common.config import GIT_COLLECTION_NAME, GITHUB_APP_ID, GITHUB_FETCH_MODE, GITHUB_HTTP_CACHE_ENABLED, GITHUB_REPO_CONCURRENCY, GITHUB_PRIVATE_KEY_PATH, README_COLLECTION_NAME
 from app.schemas.github_activity import GitActivity
-from app.vectordb.uploader import upload_data_to_db
-from app.common.utils import get_git_emails_and_ids
+from app.vectordb.upload_worker import UploadWorker
+from app.common.utils import get_git_emails_and_ids, get_git_login_emails
+
+async def fetch_repo_activity(owner: str, repo: str, access_token: str, git_email: dict[str, int], git_id: dict[str, int], date: datetime, client: httpx.AsyncClient, email_resolver: Optional[UserEmailResolver] = None):
+    if GITHUB_FETCH_MODE == "graphql":
+        try:
+            return await fetch_repo_activity_graphql(owner, repo, access_token, git_email, git_id, date, client)
+        except Exception as e:
+            print(f"{owner}/{repo} GraphQL 조회 실패. REST로 다시 조회합니다: {e}")
+
+    # 커밋/PR/이슈/README 조회는 서로 독립적이므로 동시에 요청하고, 업로드는 기존 순서대로 요청
+    # 하나가 실패하면 나머지 조회는 취소하여 버려질 결과에 API 한도를 쓰지 않음
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(fetch_all_branch_commits(owner, repo, access_token, git_email, date, client)),
+                group.create_task(fetch_pull_requests(owner, repo, access_token, git_email, git_id, date, client, email_resolver)),
+                group.create_task(fetch_issues(owner, repo, access_token, git_email, git_id, date, client, email_resolver)),
+                group.create_task(fetch_readme(owner, repo, access_token, client)),
+            ]
+    except ExceptionGroup as e:
+        raise e.exceptions[0]
+
+    return [task.result() for task in tasks]
+
+async def save_all_data_for_repo(owner: str, repo: str, access_token: str, git_email: dict[str, int], git_id: dict[str, int], date: datetime, uploader: UploadWorker, client: httpx.AsyncClient, email_resolver: Optional[UserEmailResolver] = None):
+    commits, prs, issues, readme = await fetch_repo_activity(owner, repo, access_token, git_email, git_id, date, client, email_resolver)
 
-async def save_all_data_for_repo(owner: str, repo: str, access_token: str, git_email: dict[str, int], git_id: dict[str, int], date: datetime):
-    commits = await fetch_all_branch_commits(owner, repo, access_token, git_email, date)
     commit_records = [extract_record_from_commit_entry(commit) for commit in commits]
     if commit_records:
-        upload_data_to_db(collection_name=GIT_COLLECTION_NAME, records=commit_records)
+        await uploader.submit(GIT_COLLECTION_NAME, commit_records)
     else:
         print("커밋 데이터 없음. 업로드 생략.")
     
-    prs = await fetch_pull_requests(owner, repo, access_token, git_email, git_id, date)
     pr_records = [extract_record_from_pull_request_entry(pr) for pr in prs]
     if pr_records:
-        upload_data_to_db(collection_name=GIT_COLLECTION_NAME, records=pr_records)
+        await uploader.submit(GIT_COLLECTION_NAME, pr_records)
     else:
         print("PR 데이터 없음. 업로드 생략.")
     
-    issues = await fetch_issues(owner, repo, access_token, git_email, git_id, date)
     issue_records = [extract_record_from_issue_entry(issue) for issue in issues]
     if issue_records:
-        upload_data_to_db(collection_name=GIT_COLLECTION_NAME, records=issue_records)
+        await uploader.submit(GIT_COLLECTION_NAME, issue_records)
     else:
         print("이슈 데이터 없음. 업로드 생략.")
     
-    readme = await fetch_readme(owner, repo, access_token)
-    
     if readme:
         readme_record = extract_record_from_readme(readme)
     else: 
         readme_record = None
 
     if readme_record:
-        upload_data_to_db(collection_name=README_COLLECTION_NAME, records=[readme_record])
-        print(f"README 업로드 완료: {readme_record.metadata.repo_name}")
+        await uploader.submit(README_COLLECTION_NAME, [readme_record])
+        print(f"README 업로드 요청: {readme_record.metadata.repo_name}")
     else:
         print("README 데이터 없음. 업로드 생략.")
     
@@ -51,20 +77,62 @@ async def save_all_data_for_repo(owner: str, repo: str, access_token: str, git_e
     )
 
 
+async def save_repo_data_safely(owner: str, repo: str, access_token: str, git_email: dict[str, int], git_id: dict[str, int], date: datetime, uploader: UploadWorker, client: httpx.AsyncClient, email_resolver: UserEmailResolver, semaphore: asyncio.Semaphore) -> Optional[GitActivity]:
+    """
+    동시 수집 저장소 수를 제한하여 save_all_data_for_repo를 실행합니다.
+    한 저장소에서 오류가 나도 다른 저장소 수집은 계속되도록 오류를 기록하고 None을 반환합니다.
+    """
+    async with semaphore:
+        try:
+            return await save_all_data_for_repo(owner, repo, access_token, git_email, git_id, date, uploader, client, email_resolver)
+        except Exception as e:
+            print(f"{owner}/{repo} 저장소 수집 중 오류 발생: {e}")
+            return None
+
+
 async def save_github_data(db: Session, date: datetime):
     # TODO: 오늘 날짜 데이터만 긁어올 수 있도록 수정
     private_key = load_private_key(GITHUB_PRIVATE_KEY_PATH)
     jwt_token = create_jwt_token(GITHUB_APP_ID, private_key)
-    access_tokens = get_installation_access_token(jwt_token, db) # list로 반환
     git_email, git_id = get_git_emails_and_ids(db)
+    # 모든 설치/저장소가 공유하는 로그인 → 이메일 조회기 (등록된 팀원은 API 호출 없이 조회)
+    email_resolver = UserEmailResolver(seed=get_git_login_emails(db), cache=get_user_email_cache())
     
     results = []
     
-    for access_token in access_tokens:
-        repos = await fetch_repositories(access_token=access_token)
-        
-        for owner, repo in repos:
-            result = await save_all_data_for_repo(owner, repo, access_token, git_email, git_id, date)
-            results.append(result)
+    # 배치 1회 동안 GitHub 커넥션 풀을 공유
+    # 한 저장소의 레코드를 임베딩/업로드하는 동안 다음 저장소의 API 호출을 진행
+    async with create_github_client() as client, UploadWorker(record_events=True) as uploader:
+        access_tokens = await get_installation_access_token(jwt_token, db, client) # list로 반환
+
+        # 설치(installation)별 저장소 목록을 동시에 조회. 조회에 실패한 설치는 건너뜀
+        repo_lists = await asyncio.gather(
+            *(fetch_repositories(access_token=access_token, client=client) for access_token in access_tokens),
+            return_exceptions=True
+        )
+
+        jobs = []
+        for access_token, repos in zip(access_tokens, repo_lists):
+            if isinstance(repos, Exception):
+                print(f"저장소 목록 조회 중 오류 발생: {repos}")
+                continue
+            jobs.extend((owner, repo, access_token) for owner, repo in repos)
+
+        # 저장소 단위로 동시에 수집. gather는 입력 순서대로 결과를 반환하므로 설치 → 저장소 순서가 유지됨
+        semaphore = asyncio.Semaphore(GITHUB_REPO_CONCURRENCY)
+        repo_results = await asyncio.gather(*(
+            save_repo_data_safely(owner, repo, access_token, git_email, git_id, date, uploader, client, email_resolver, semaphore)
+            for owner, repo, access_token in jobs
+        ))
+        results = [result for result in repo_results if result is not None]
+
+    # 이번 실행에서 확인한 공개 이메일을 디스크 캐시에 기록
+    await email_resolver.flush()
+
+    for label, budget in get_rate_limit_stats().items():
+        print(f"GitHub API 예산 [{label}]: {budget}")
+    print(f"GitHub 사용자 이메일 조회 API 호출: {email_resolver.api_calls}건")
+    if GITHUB_HTTP_CACHE_ENABLED:
+        print(f"GitHub 응답 캐시: {get_http_cache().stats()}")
 
     return results
@@ -11,7 +11,8 @@ DATABASE_URL = (
     f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL 로그가 필요할 때만 DB_ECHO=true로 설정
+engine = create_engine(DATABASE_URL, echo=os.getenv("DB_ECHO", "false").lower() == "true")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -1,5 +1,10 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import delete, func, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from app.rdb.schema import Team, User, TeamMember, GitInfo, DailyUserActivity, DailyTeamActivity
+from app.rdb.schema import ActivityEvent, Team, User, TeamMember, GitInfo, DailyUserActivity, DailyTeamActivity
 
 # 모든 팀 조회
 def find_all_teams(db: Session) -> list[Team]:
@@ -16,24 +21,92 @@ def find_all_team_members(db: Session) -> list[TeamMember]:
 def find_all_git_info(db: Session) -> list[GitInfo]:
     return db.query(GitInfo).all()
 
-def save_daily_user_activity(activity: DailyUserActivity, db: Session):
-    db.add(activity)
-    db.commit()
+def replace_daily_activities(user_rows: list[dict], team_rows: Optional[list[dict]], db: Session, batch_size: int = 1000):
+    """
+    기존 사용자/팀 활동 통계를 지우고 새 주간 데이터를 한 트랜잭션에서 일괄 저장합니다.
+    커밋 전까지 다른 세션은 이전 데이터를 보므로 테이블이 빈 상태로 노출되지 않습니다.
+    팀 통계는 savepoint 안에서 교체하므로, 팀 저장에 실패하면 이전 팀 통계를 유지하고 사용자 통계는 그대로 저장합니다.
+    team_rows가 None이면 팀 통계는 교체하지 않습니다.
+    """
+    try:
+        db.execute(delete(DailyUserActivity))
+        for start in range(0, len(user_rows), batch_size):
+            db.execute(insert(DailyUserActivity), user_rows[start:start + batch_size])
 
-def flush_daily_user_activity_if_exists(db: Session):
-    exists = db.query(DailyUserActivity).first() is not None
+        if team_rows is not None:
+            _replace_team_activities(team_rows, db, batch_size)
 
-    if exists:
-        db.query(DailyUserActivity).delete()
         db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
-def flush_team_activity_if_exists(db: Session):
-    exists = db.query(DailyTeamActivity).first() is not None
+def _replace_team_activities(team_rows: list[dict], db: Session, batch_size: int):
+    try:
+        with db.begin_nested():
+            db.execute(delete(DailyTeamActivity))
+            for start in range(0, len(team_rows), batch_size):
+                db.execute(insert(DailyTeamActivity), team_rows[start:start + batch_size])
+    except Exception as e:
+        print(f"팀 활동 통계 저장 실패 (사용자 통계만 저장): {e}")
 
-    if exists:
-        db.query(DailyTeamActivity).delete()
+def create_activity_event_table(engine: Engine):
+    """
+    활동 이벤트 테이블이 없으면 생성합니다. 프로세스 시작 시 한 번만 호출합니다.
+    """
+    ActivityEvent.__table__.create(bind=engine, checkfirst=True)
+
+def save_activity_events(rows: list[dict], db: Session, batch_size: int = 1000):
+    """
+    활동 이벤트를 일괄 저장합니다. 이미 기록된 (source_id, user_id, category)는 새로 추가하지 않고
+    날짜만 갱신하여, VectorDB upsert와 같이 마지막 수집 결과가 반영되도록 합니다.
+    """
+    if not rows:
+        return
+
+    try:
+        for start in range(0, len(rows), batch_size):
+            stmt = pg_insert(ActivityEvent).values(rows[start:start + batch_size])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["source_id", "user_id", "category"],
+                set_={"activity_date": stmt.excluded.activity_date},
+            ))
         db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+def find_activity_counts(start_date: date, end_date: date, db: Session) -> list:
+    """
+    기간 내 (사용자, 날짜, 항목)별 활동 이벤트 수를 반환합니다.
+    """
+    return (
+        db.query(
+            ActivityEvent.user_id,
+            ActivityEvent.activity_date,
+            ActivityEvent.category,
+            func.count(),
+        )
+        .filter(ActivityEvent.activity_date >= start_date, ActivityEvent.activity_date <= end_date)
+        .group_by(ActivityEvent.user_id, ActivityEvent.activity_date, ActivityEvent.category)
+        .all()
+    )
+
+def find_daily_user_activities(start_date: date, end_date: date, db: Session, user_id: int = None) -> list[DailyUserActivity]:
+    query = db.query(DailyUserActivity).filter(
+        DailyUserActivity.report_date >= start_date,
+        DailyUserActivity.report_date <= end_date,
+    )
+    if user_id is not None:
+        query = query.filter(DailyUserActivity.user_id == user_id)
+    return query.order_by(DailyUserActivity.user_id, DailyUserActivity.report_date).all()
+
+def find_daily_team_activities(start_date: date, end_date: date, db: Session, team_id: str = None) -> list[DailyTeamActivity]:
+    query = db.query(DailyTeamActivity).filter(
+        DailyTeamActivity.report_date >= start_date,
+        DailyTeamActivity.report_date <= end_date,
+    )
+    if team_id is not None:
+        query = query.filter(DailyTeamActivity.team_id == team_id)
+    return query.order_by(DailyTeamActivity.team_id, DailyTeamActivity.report_date).all()
 
-def delete_all_daily_user_activities(db: Session):
-    db.query(DailyUserActivity).delete()
-    db.commit()
\ No newline at end of file
@@ -103,7 +103,7 @@ class DailyTeamActivity(Base):
     __tablename__ = "daily_team_activity"
 
     id = Column(Integer, primary_key=True, index=True)
-    team_id = Column(Integer, ForeignKey("team.id"), nullable=False)
+    team_id = Column(String, ForeignKey("team.id"), nullable=False)
     report_date = Column(Date, nullable=False)
     day = Column(SQLAlchemyEnum(Weekday, native_enum=False), nullable=False)
     teams_post = Column(Integer, nullable=False)
@@ -121,4 +121,15 @@ class DailyTeamActivity(Base):
     team = relationship("Team", lazy="select")
 
 
+class ActivityEvent(Base):
+    """
+    수집 시점에 기록하는 활동 이벤트. (point ID, 사용자, 항목) 단위로 한 번만 저장되어
+    같은 데이터를 다시 수집해도 집계가 중복되지 않습니다.
+    """
+    __tablename__ = "activity_event"
+
+    source_id = Column(String, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+    category = Column(String, primary_key=True)
+    activity_date = Column(Date, nullable=False, index=True)
 
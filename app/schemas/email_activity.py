@@ -11,3 +11,4 @@ class EmailEntry(BaseModel):
     date: datetime
     conversation_id: Optional[str]
     attachment_list: Optional[List[str]]
+    message_id: Optional[str] = None
@@ -9,6 +9,7 @@ class ReplyEntry(BaseModel):
   content: str
   date: datetime
   attachments: Optional[List[str]]
+  message_id: Optional[str] = None
 
 class PostEntry(BaseModel):
   author: int
@@ -19,3 +20,4 @@ class PostEntry(BaseModel):
   attachments: Optional[List[str]]
   application_content: Optional[List[str]]
   date: datetime
+  message_id: Optional[str] = None
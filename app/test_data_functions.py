@@ -76,7 +76,8 @@ def load_emails_from_json(file_path: str) -> List[EmailEntry]:
             content=entry['content'],
             date=datetime.fromisoformat(entry['date']),
             conversation_id=entry.get('conversation_id'),
-            attachment_list=entry.get('attachment_list')
+            attachment_list=entry.get('attachment_list'),
+            message_id=entry.get('message_id')
         )
         emails.append(email)
 
@@ -96,7 +97,8 @@ def load_posts_from_json(file_path: str) -> List[PostEntry]:
                     author=reply['author'],
                     content=reply['content'],
                     date=datetime.fromisoformat(reply['date']+"+09:00"),
-                    attachments=reply.get('attachments')
+                    attachments=reply.get('attachments'),
+                    message_id=reply.get('message_id')
                 )
                 for reply in entry['replies']
             ]
@@ -109,7 +111,8 @@ def load_posts_from_json(file_path: str) -> List[PostEntry]:
             replies=replies,
             attachments=entry.get('attachments'),
             application_content=entry.get('application_content'),
-            date=datetime.fromisoformat(entry['date']+"+09:00")
+            date=datetime.fromisoformat(entry['date']+"+09:00"),
+            message_id=entry.get('message_id')
         )
         posts.append(post)
 
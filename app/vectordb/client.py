@@ -1,28 +1,168 @@
-from typing import List
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.models import (
+  CollectionParamsDiff,
+  DatetimeRange,
+  Distance,
+  FieldCondition,
+  Filter,
+  HasIdCondition,
+  HnswConfigDiff,
+  MatchValue,
+  PayloadSchemaType,
+  PointIdsList,
+  ScalarQuantization,
+  ScalarQuantizationConfig,
+  ScalarType,
+  VectorParams,
+  VectorParamsDiff,
+)
 import requests
 import os
 from dotenv import load_dotenv
 
-from app.common.config import DOCS_COLLECTION_NAME, EMAIL_COLLECTION_NAME, GIT_COLLECTION_NAME, README_COLLECTION_NAME, TEAMS_COLLECTION_NAME
+from app.vectordb.embedding import get_embedding_model
+from app.common.config import COLLECTION_PAYLOAD_INDEXES, COLLECTION_RETENTION_FIELDS, COLLECTION_STORAGE_PROFILES, DEFAULT_STORAGE_PROFILE, DOCS_COLLECTION_NAME, EMAIL_COLLECTION_NAME, GIT_COLLECTION_NAME, README_COLLECTION_NAME, TEAMS_COLLECTION_NAME, VECTORDB_CLEANUP_MODE, VECTORDB_DELETE_BATCH_SIZE, VECTORDB_RETENTION_DAYS
+from app.vectordb.schema import make_point_id
 
 load_dotenv()
 
+QDRANT_HOST = os.getenv("QDRANT_HOST")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "60"))
+
+# 프로세스 전역에서 공유하는 클라이언트 (내부 커넥션 풀 재사용)
+_client: Optional[QdrantClient] = None
+_client_lock = threading.Lock()
+
+def _client_options() -> dict:
+  return {
+    "host": QDRANT_HOST,
+    "port": QDRANT_PORT,
+    "grpc_port": QDRANT_GRPC_PORT,
+    "prefer_grpc": QDRANT_PREFER_GRPC,
+    "timeout": QDRANT_TIMEOUT,
+  }
+
 def get_qdrant_client() -> QdrantClient:
-  QDRANT_HOST = os.getenv("QDRANT_HOST")
-  QDRANT_PORT = os.getenv("QDRANT_PORT", "6333")
+  global _client
 
-  return QdrantClient(
-    host=QDRANT_HOST,
-    port=QDRANT_PORT
-  )
+  if _client is None:
+    with _client_lock:
+      if _client is None:
+        _client = QdrantClient(**_client_options())
+  return _client
+
+@asynccontextmanager
+async def open_async_qdrant_client() -> AsyncIterator[AsyncQdrantClient]:
+  """
+  호출한 이벤트 루프에서만 사용하고 닫는 비동기 클라이언트
+  비동기 클라이언트는 이벤트 루프에 묶이므로 공유하지 않고, job(또는 요청) 단위로 열고 닫습니다.
+  """
+  client = AsyncQdrantClient(**_client_options())
+  try:
+    yield client
+  finally:
+    await client.close()
+
+def close_qdrant_client():
+  global _client
+
+  with _client_lock:
+    client, _client = _client, None
+
+  if client is not None:
+    client.close()
+
+def get_storage_profile(collection_name: str) -> dict:
+  return {**DEFAULT_STORAGE_PROFILE, **COLLECTION_STORAGE_PROFILES.get(collection_name, {})}
+
+def create_collection(client: QdrantClient, collection_name: str, vector_size: Optional[int] = None): 
+  if vector_size is None:
+    vector_size = get_embedding_model().get_sentence_embedding_dimension()
+
+  profile = get_storage_profile(collection_name)
+  hnsw_config = HnswConfigDiff(**profile["hnsw"]) if profile["hnsw"] else None
 
-def create_collection(client: QdrantClient, collection_name: str): 
+  # None인 항목은 전달하지 않아 Qdrant 서버 기본값을 따름
   client.create_collection(
       collection_name=collection_name,
-      vectors_config=VectorParams(size=384, distance=Distance.COSINE),
+      vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=profile["on_disk_vectors"]),
+      on_disk_payload=profile["on_disk_payload"],
+      quantization_config=_quantization_config(profile),
+      hnsw_config=hnsw_config,
   )
+  print(f"컬렉션 생성: {collection_name} (size={vector_size}, profile={profile})")
+  ensure_payload_indexes(client=client, collection_name=collection_name)
+
+def _quantization_config(profile: dict) -> Optional[ScalarQuantization]:
+  if profile["quantization"] == "int8":
+    return ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+    )
+  return None
+
+def _hnsw_value(hnsw_config, key: str, expected):
+  # on_disk처럼 bool인 항목은 서버가 None(미설정)을 돌려주므로 bool로 맞춰서 비교
+  value = getattr(hnsw_config, key, None)
+  return bool(value) if isinstance(expected, bool) else value
+
+def ensure_storage_profile(client: QdrantClient, collection_name: str):
+  """
+  기존 컬렉션의 설정이 저장 프로파일과 다르면 update_collection으로 맞춥니다.
+  retention 정리 방식에서는 컬렉션이 다시 생성되지 않으므로 프로파일 변경을 이 단계에서 반영합니다.
+  (양자화는 프로파일에 지정된 경우에만 적용하며, 이미 적용된 양자화를 해제하지는 않음)
+  """
+  profile = get_storage_profile(collection_name)
+  config = client.get_collection(collection_name).config
+  changes = {}
+
+  # 프로파일 값이 None인 항목은 서버 기본값을 유지하므로 비교하지 않음
+  vectors = config.params.vectors
+  if profile["on_disk_vectors"] is not None and isinstance(vectors, VectorParams) and bool(vectors.on_disk) != profile["on_disk_vectors"]:
+    changes["vectors_config"] = {"": VectorParamsDiff(on_disk=profile["on_disk_vectors"])}
+
+  if profile["on_disk_payload"] is not None and bool(config.params.on_disk_payload) != profile["on_disk_payload"]:
+    changes["collection_params"] = CollectionParamsDiff(on_disk_payload=profile["on_disk_payload"])
+
+  quantization_config = _quantization_config(profile)
+  if quantization_config is not None and config.quantization_config is None:
+    changes["quantization_config"] = quantization_config
+
+  if profile["hnsw"] and any(_hnsw_value(config.hnsw_config, key, value) != value for key, value in profile["hnsw"].items()):
+    changes["hnsw_config"] = HnswConfigDiff(**profile["hnsw"])
+
+  if not changes:
+    return
+
+  client.update_collection(collection_name=collection_name, **changes)
+  print(f"컬렉션 설정 변경: {collection_name} ({', '.join(changes)})")
+
+def ensure_payload_indexes(client: QdrantClient, collection_name: str):
+  """
+  config에 선언된 payload 인덱스 중 컬렉션에 아직 없는 것을 생성합니다.
+  신규 생성뿐 아니라 기존 컬렉션 마이그레이션에도 사용합니다.
+  """
+  schema = COLLECTION_PAYLOAD_INDEXES.get(collection_name, {})
+  if not schema:
+    return
+
+  existing = client.get_collection(collection_name).payload_schema or {}
+
+  for field_name, field_type in schema.items():
+    if field_name in existing:
+      continue
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name=field_name,
+        field_schema=PayloadSchemaType(field_type),
+    )
+    print(f"payload 인덱스 생성: {collection_name}.{field_name} ({field_type})")
   
 def flush_all_collections():
     client = get_qdrant_client()
@@ -48,4 +188,114 @@ def flush_all_collections():
         for name, msg in errors:
             print(f" - {name}: {msg}")
 
-    return "완료!"
\ No newline at end of file
+    return "완료!"
+
+def cleanup_collections():
+    """
+    토요일 배치의 VectorDB 정리. VECTORDB_CLEANUP_MODE에 따라 보존 기간 정리 또는 전체 삭제를 수행합니다.
+    """
+    if VECTORDB_CLEANUP_MODE == "flush":
+        return flush_all_collections()
+    return apply_retention()
+
+def apply_retention(retention_days: int = VECTORDB_RETENTION_DAYS, batch_size: int = VECTORDB_DELETE_BATCH_SIZE):
+    """
+    보존 기간(retention_days)이 지난 point를 컬렉션별 날짜 필드 기준으로 나눠서 삭제합니다.
+    README는 저장소별 최신 1건만 남기고 나머지를 삭제합니다.
+    """
+    client = get_qdrant_client()
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    for collection_name, date_field in COLLECTION_RETENTION_FIELDS.items():
+        try:
+            if not client.collection_exists(collection_name):
+                continue
+
+            deleted = _delete_by_filter(
+                client,
+                collection_name,
+                Filter(must=[FieldCondition(key=date_field, range=DatetimeRange(lt=cutoff))]),
+                batch_size,
+            )
+            print(f"{collection_name}: {cutoff} 이전 point {deleted}건 삭제")
+        except Exception as e:
+            print(f"Unexpected error while applying retention to {collection_name}: {e}")
+
+    try:
+        prune_stale_readmes(client, batch_size)
+    except Exception as e:
+        print(f"Unexpected error while pruning {README_COLLECTION_NAME}: {e}")
+
+    return "완료!"
+
+def _delete_by_filter(client: QdrantClient, collection_name: str, points_filter: Filter, batch_size: int) -> int:
+    deleted = 0
+
+    while True:
+        points, _ = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=points_filter,
+            limit=batch_size,
+            with_payload=False,
+            with_vectors=False,
+        )
+        if not points:
+            return deleted
+
+        client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(points=[point.id for point in points]),
+            wait=True,
+        )
+        deleted += len(points)
+
+def delete_stale_document_chunks(file_id: str, keep_ids: List[str], batch_size: int = VECTORDB_DELETE_BATCH_SIZE) -> int:
+    """
+    문서를 다시 수집했을 때 이번 청크 ID에 없는 이전 청크(청크 수가 줄어든 경우 등)를 삭제합니다.
+    """
+    client = get_qdrant_client()
+    if not client.collection_exists(DOCS_COLLECTION_NAME):
+        return 0
+
+    stale_filter = Filter(
+        must=[FieldCondition(key="file_id", match=MatchValue(value=file_id))],
+        must_not=[HasIdCondition(has_id=keep_ids)] if keep_ids else None,
+    )
+    deleted = _delete_by_filter(client, DOCS_COLLECTION_NAME, stale_filter, batch_size)
+    if deleted:
+        print(f"문서 {file_id}의 이전 청크 {deleted}건 삭제")
+    return deleted
+
+def prune_stale_readmes(client: QdrantClient, batch_size: int = VECTORDB_DELETE_BATCH_SIZE):
+    """
+    README point ID는 저장소 이름으로 정해지므로, 그 ID가 아닌 README(이전 해시의 중복 point)를 삭제합니다.
+    """
+    if not client.collection_exists(README_COLLECTION_NAME):
+        return
+
+    stale = []
+    offset = None
+
+    while True:
+        points, offset = client.scroll(
+            collection_name=README_COLLECTION_NAME,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["repo_name"],
+            with_vectors=False,
+        )
+        for point in points:
+            repo_name = (point.payload or {}).get("repo_name")
+            if str(point.id) != make_point_id("readme", repo_name):
+                stale.append(point.id)
+
+        if offset is None:
+            break
+
+    for start in range(0, len(stale), batch_size):
+        client.delete(
+            collection_name=README_COLLECTION_NAME,
+            points_selector=PointIdsList(points=stale[start:start + batch_size]),
+            wait=True,
+        )
+    print(f"{README_COLLECTION_NAME}: 이전 README point {len(stale)}건 삭제")
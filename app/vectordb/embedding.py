@@ -0,0 +1,131 @@
+import atexit
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from sentence_transformers import SentenceTransformer
+
+from app.common.config import EMBEDDING_BATCH_SIZE, EMBEDDING_DEVICE, EMBEDDING_MODEL_NAME, EMBEDDING_POOL_THRESHOLD, EMBEDDING_POOL_WORKERS
+
+# (모델 이름, device) -> 로드된 모델. 프로세스당 한 번만 로드한다.
+_models: Dict[Tuple[str, Optional[str]], SentenceTransformer] = {}
+_lock = threading.Lock()
+
+# 모델별 멀티 프로세스 인코딩 풀 (워커마다 모델을 한 번씩 로드)
+_pools: Dict[int, dict] = {}
+
+# 인코딩 풀 워커의 스레드 수를 정하는 환경 변수 (이미 설정된 값은 그대로 사용)
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+
+# 모델 로드 지표 (로드 횟수, 누적 로드 시간)
+model_load_stats = {
+    "load_count": 0,
+    "load_seconds": 0.0,
+}
+
+def get_embedding_model(
+    model_name: str = EMBEDDING_MODEL_NAME,
+    device: Optional[str] = EMBEDDING_DEVICE,
+) -> SentenceTransformer:
+    """
+    프로세스 전역에서 공유하는 임베딩 모델을 반환합니다.
+    (model_name, device) 조합별로 최초 호출 시에만 로드합니다.
+    """
+    key = (model_name, device)
+
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            start = time.perf_counter()
+            model = SentenceTransformer(model_name, device=device)
+            elapsed = time.perf_counter() - start
+
+            model_load_stats["load_count"] += 1
+            model_load_stats["load_seconds"] += elapsed
+            print(f"임베딩 모델 로드 완료: {model_name} (device={device}, {elapsed:.2f}s)")
+
+            _models[key] = model
+
+    return model
+
+def get_model_load_stats() -> dict:
+    return dict(model_load_stats)
+
+def get_encode_pool(model: SentenceTransformer, workers: int = EMBEDDING_POOL_WORKERS) -> dict:
+    """
+    CPU 코어 여러 개로 인코딩하기 위한 프로세스 풀을 반환합니다. 최초 호출 시에만 생성합니다.
+    """
+    key = id(model)
+
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            device = model.device.type
+            # 워커마다 torch가 전체 코어 수만큼 스레드를 쓰지 않도록 워커당 스레드 수를 제한 (spawn된 워커는 환경 변수를 상속)
+            threads = str(max(1, (os.cpu_count() or 1) // workers))
+            saved = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+            for name in _THREAD_ENV_VARS:
+                os.environ.setdefault(name, threads)
+            try:
+                pool = model.start_multi_process_pool(target_devices=[device] * workers)
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+            _pools[key] = pool
+            print(f"멀티 프로세스 인코딩 풀 시작: {workers} workers ({device}, 워커당 {os.environ.get('OMP_NUM_THREADS', threads)} threads)")
+
+    return pool
+
+@atexit.register
+def stop_encode_pools():
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        SentenceTransformer.stop_multi_process_pool(pool)
+
+def encode_texts(
+    texts: List[str],
+    model: Optional[SentenceTransformer] = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> List[List[float]]:
+    """
+    텍스트 목록을 배치 단위로 임베딩합니다.
+    길이순으로 정렬해 배치 내 패딩을 줄이고, 결과는 입력 순서대로 반환합니다.
+    """
+    if not texts:
+        return []
+
+    model = model or get_embedding_model()
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+    if EMBEDDING_POOL_WORKERS > 1 and len(texts) >= EMBEDDING_POOL_THRESHOLD:
+        pool = get_encode_pool(model)
+        embeddings = model.encode_multi_process(
+            [texts[i] for i in order],
+            pool,
+            batch_size=batch_size,
+        )
+        for i, embedding in zip(order, embeddings):
+            vectors[i] = embedding.tolist()
+        return vectors
+
+    for start in range(0, len(order), batch_size):
+        batch_idx = order[start:start + batch_size]
+        embeddings = model.encode(
+            [texts[i] for i in batch_idx],
+            batch_size=batch_size,
+            show_progress_bar=False,
+        )
+        for i, embedding in zip(batch_idx, embeddings):
+            vectors[i] = embedding.tolist()
+
+    return vectors
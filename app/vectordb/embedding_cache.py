@@ -0,0 +1,130 @@
+import hashlib
+import time
+import unicodedata
+from typing import Dict, List
+import numpy as np
+
+from app.common.cache import SqliteCache, lazy_singleton
+from app.common.config import EMBEDDING_CACHE_MAX_MB, EMBEDDING_CACHE_PATH
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "").strip()
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(SqliteCache):
+    """
+    (모델 이름, 정규화된 텍스트의 sha256)을 키로 임베딩 벡터를 SQLite에 저장하는 디스크 캐시.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_bytes: int = EMBEDDING_CACHE_MAX_MB * 1024 * 1024):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model_name, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        # 전체 크기는 열 때 계산하고 이후 저장/삭제 시 갱신 (정리 직전에는 다시 계산)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model_name: str, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            # SQLite 바인딩 변수 제한을 피하기 위해 나눠서 조회
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model_name = ? AND text_hash IN ({placeholders})",
+                    [model_name, *chunk],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model_name = ? AND text_hash = ?",
+                    [(now, model_name, key) for key in found],
+                )
+                self._conn.commit()
+
+            hit_count = sum(1 for key in hashes if key in found)
+            self.hits += hit_count
+            self.misses += len(hashes) - hit_count
+
+        return found
+
+    def put_many(self, model_name: str, items: Dict[str, List[float]]):
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (model_name, key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+
+        with self._lock:
+            # 같은 키를 덮어쓰는 경우 기존 크기를 빼서 합계를 맞춤
+            replaced = 0
+            keys = list(items)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                replaced += self._conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings WHERE model_name = ? AND text_hash IN ({placeholders})",
+                    [model_name, *chunk],
+                ).fetchone()[0]
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model_name, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self._total_bytes += sum(len(row[2]) for row in rows) - replaced
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # API 프로세스와 스케줄러가 같은 파일을 쓰므로 추적한 합계는 다른 프로세스의 저장/삭제를 모름
+        # 정리가 필요할 때만 실제 크기를 다시 계산해서 기준으로 사용
+        total = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+        self._total_bytes = total
+        if total <= self.max_bytes:
+            return
+
+        # 최대 크기의 90%까지 LRU 순으로 제거
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        cursor = self._conn.execute("SELECT model_name, text_hash, LENGTH(vector) FROM embeddings ORDER BY last_used")
+        victims = []
+        for model_name, key, size in cursor:
+            if total - removed <= target:
+                break
+            victims.append((model_name, key))
+            removed += size
+
+        self._conn.executemany("DELETE FROM embeddings WHERE model_name = ? AND text_hash = ?", victims)
+        self._conn.commit()
+        self._total_bytes = total - removed
+        print(f"임베딩 캐시 정리: {len(victims)}건 제거 ({removed / 1024 / 1024:.1f}MB)")
+
+
+get_embedding_cache = lazy_singleton(EmbeddingCache)
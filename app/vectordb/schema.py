@@ -1,7 +1,7 @@
 
 from datetime import datetime
 from typing import Generic, List, TypeVar
-from uuid import uuid4
+from uuid import UUID, uuid4, uuid5
 from pydantic import BaseModel, Field
 
 class BaseMetadata(BaseModel):
@@ -60,6 +60,16 @@ class GitReadMeMetadata(BaseMetadata):
   download_url: str
   readme_hash: str
   
+# 소스 키 기반 point ID 생성용 네임스페이스 (변경 시 기존 point와 ID가 달라지므로 고정)
+POINT_ID_NAMESPACE = UUID("6f1c2a8e-4b1d-5c7e-9a3f-2d8b7e6c5a41")
+
+def make_point_id(*parts) -> str:
+  """
+  소스 키(commit sha, repo+PR 번호, Graph 메시지 ID 등)로부터 결정적인 UUID를 생성합니다.
+  같은 데이터를 다시 수집해도 같은 ID로 upsert되어 중복 point가 생기지 않습니다.
+  """
+  return str(uuid5(POINT_ID_NAMESPACE, ":".join(str(part) for part in parts)))
+
 M = TypeVar("M", bound=BaseMetadata)
 
 class BaseRecord(BaseModel, Generic[M]):
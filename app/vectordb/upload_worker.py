@@ -0,0 +1,78 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from app.common.activity_counter import record_activity_events
+from app.common.config import UPLOAD_QUEUE_SIZE
+from app.rdb.client import SessionLocal
+from app.vectordb.schema import BaseRecord
+from app.vectordb.uploader import upload_data_to_db
+
+class UploadWorker:
+    """
+    임베딩과 Qdrant 업로드를 백그라운드 스레드에서 처리하는 작업자.
+
+    파이프라인은 수집한 레코드를 submit으로 넘기고 바로 다음 수집을 진행합니다.
+    큐가 가득 차면 submit이 대기하므로(backpressure) 메모리에 쌓이는 레코드 수가 제한됩니다.
+    record_events가 True이면 업로드에 성공한 레코드의 활동 이벤트를 함께 기록합니다.
+    (작업 스레드에서 별도의 세션을 열어 기록하며, 파이프라인의 세션은 다른 스레드로 넘기지 않음)
+
+        async with UploadWorker() as uploader:
+            await uploader.submit(GIT_COLLECTION_NAME, records)
+    """
+
+    def __init__(self, record_events: bool = False, maxsize: int = UPLOAD_QUEUE_SIZE):
+        self._record_events = record_events
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._consumer: Optional[asyncio.Task] = None
+        self.errors: List[Tuple[str, Exception]] = []
+
+    async def __aenter__(self) -> "UploadWorker":
+        self._consumer = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._consumer.cancel()
+            await asyncio.gather(self._consumer, return_exceptions=True)
+            return False
+
+        await self._queue.put(None)
+        await self._consumer
+
+        if self.errors:
+            collection_name, error = self.errors[0]
+            print(f"업로드 실패 {len(self.errors)}건 (첫 실패: {collection_name})")
+            raise error
+        return False
+
+    async def submit(self, collection_name: str, records: List[BaseRecord]):
+        if not records:
+            return
+        await self._queue.put((collection_name, records))
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            collection_name, records = item
+            try:
+                # CPU 연산(encode)과 DB 기록을 이벤트 루프 밖에서 실행하여 수집 I/O를 막지 않음
+                await asyncio.to_thread(self._upload, collection_name, records)
+            except Exception as e:
+                print(f"{collection_name} 업로드 중 오류 발생: {e}")
+                self.errors.append((collection_name, e))
+
+    def _upload(self, collection_name: str, records: List[BaseRecord]):
+        upload_data_to_db(collection_name, records)
+
+        if self._record_events:
+            # 이벤트 기록 실패는 업로드 실패로 처리하지 않음 (통계는 count/aggregate 방식으로 다시 계산 가능)
+            db = SessionLocal()
+            try:
+                record_activity_events(collection_name, records, db)
+            except Exception as e:
+                print(f"{collection_name} 활동 이벤트 기록 중 오류 발생: {e}")
+            finally:
+                db.close()
@@ -1,44 +1,162 @@
-from app.common.config import EMBEDDING_MODEL_NAME
-from app.vectordb.client import create_collection, get_qdrant_client
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+from app.common.config import EMBEDDING_CACHE_ENABLED, EMBEDDING_MODEL_NAME, QDRANT_UPSERT_BATCH_SIZE, QDRANT_UPSERT_MAX_RETRIES, QDRANT_UPSERT_PARALLELISM
+from app.vectordb.client import create_collection, ensure_payload_indexes, ensure_storage_profile, get_qdrant_client
+from app.vectordb.embedding import encode_texts, get_embedding_model
+from app.vectordb.embedding_cache import get_embedding_cache, text_hash
 from app.vectordb.schema import BaseRecord
-from sentence_transformers import SentenceTransformer
-from typing import List
+from typing import Iterator, List
 from pydantic import BaseModel
 
+# 이번 프로세스에서 payload 인덱스와 저장 프로파일 확인을 마친 컬렉션
+_indexed_collections = set()
+
 def upload_data_to_db(
     collection_name: str,
     records: List[BaseRecord],
 ): 
-    embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    embedding_model = get_embedding_model()
     
     client = get_qdrant_client()
     
     print("벡터DB 클라이언트 연결 완료")
     
     if not client.collection_exists(collection_name):
-        create_collection(client=client, collection_name=collection_name)
+        create_collection(
+            client=client,
+            collection_name=collection_name,
+            vector_size=embedding_model.get_sentence_embedding_dimension(),
+        )
+    elif collection_name not in _indexed_collections:
+        # 인덱스 스키마 / 저장 프로파일 추가 이전에 생성된 컬렉션 마이그레이션
+        ensure_payload_indexes(client=client, collection_name=collection_name)
+        ensure_storage_profile(client=client, collection_name=collection_name)
+    _indexed_collections.add(collection_name)
     
     print("데이터 저장 시작!")
     
-    points = []
-    for record in records:
-        # 임베딩 직접 생성 (만약 record.vector가 없으면)
-        vector = record.vector if hasattr(record, "vector") else embedding_model.encode(record.text).tolist()
-
-        # 메타데이터 dict로 변환
-        metadata = record.metadata.model_dump() if hasattr(record.metadata, "model_dump") else dict(record.metadata)
-        metadata["page_content"] = record.text
-        
-        points.append({
-            "id": record.id,
-            "vector": vector,
-            "payload": metadata
-        })
-    
-    if points:
-        client.upsert(
-            collection_name=collection_name,
-            points=points
-        )
+    vectors = embed_records(records, embedding_model)
+
+    upsert_in_batches(
+        client=client,
+        collection_name=collection_name,
+        batches=iter_point_batches(records, vectors),
+    )
     
     print("데이터 저장 완료!")
+
+def embed_records(records: List[BaseRecord], embedding_model) -> dict:
+    """
+    벡터가 없는 레코드의 임베딩을 {레코드 인덱스: 벡터} 형태로 반환합니다.
+    디스크 캐시에 있는 텍스트는 재사용하고, 나머지만 한 번에 배치 임베딩합니다.
+    """
+    pending = [i for i, record in enumerate(records) if not hasattr(record, "vector")]
+    if not pending:
+        return {}
+
+    if not EMBEDDING_CACHE_ENABLED:
+        encoded = encode_texts([records[i].text for i in pending], model=embedding_model)
+        return dict(zip(pending, encoded))
+
+    cache = get_embedding_cache()
+    hashes = {i: text_hash(records[i].text) for i in pending}
+    cached = cache.get_many(EMBEDDING_MODEL_NAME, list(hashes.values()))
+
+    # 같은 텍스트는 한 번만 임베딩
+    misses = {}
+    for i in pending:
+        if hashes[i] not in cached and hashes[i] not in misses:
+            misses[hashes[i]] = records[i].text
+
+    encoded = encode_texts(list(misses.values()), model=embedding_model)
+    fresh = dict(zip(misses.keys(), encoded))
+    cache.put_many(EMBEDDING_MODEL_NAME, fresh)
+
+    print(f"임베딩 캐시: {len(pending) - len(misses)}건 재사용, {len(misses)}건 신규 (누적 {cache.stats()})")
+
+    cached.update(fresh)
+    return {i: cached[hashes[i]] for i in pending}
+
+def iter_point_batches(
+    records: List[BaseRecord],
+    vectors: dict,
+    batch_size: int = QDRANT_UPSERT_BATCH_SIZE,
+) -> Iterator[List[PointStruct]]:
+    """
+    레코드를 batch_size 단위의 Qdrant point 목록으로 변환해 순서대로 반환합니다.
+    전체 point 목록을 한 번에 만들지 않으므로 메모리 사용량이 배치 크기로 제한됩니다.
+    """
+    for start in range(0, len(records), batch_size):
+        points = []
+        for idx in range(start, min(start + batch_size, len(records))):
+            record = records[idx]
+            vector = record.vector if hasattr(record, "vector") else vectors[idx]
+
+            # 메타데이터 dict로 변환 (datetime은 REST/gRPC 모두 같은 ISO 문자열로 저장되도록 json 모드 사용)
+            metadata = record.metadata.model_dump(mode="json") if hasattr(record.metadata, "model_dump") else dict(record.metadata)
+            metadata["page_content"] = record.text
+
+            points.append(PointStruct(
+                id=record.id,
+                vector=vector,
+                payload=metadata
+            ))
+        yield points
+
+def upsert_in_batches(
+    client: QdrantClient,
+    collection_name: str,
+    batches: Iterator[List[PointStruct]],
+    parallelism: int = QDRANT_UPSERT_PARALLELISM,
+    max_retries: int = QDRANT_UPSERT_MAX_RETRIES,
+):
+    """
+    point 배치를 순차 또는 병렬로 업로드합니다.
+    병렬 모드에서는 wait=False로 전송하며, 동시에 진행 중인 배치는 parallelism개로 제한합니다.
+    """
+    if parallelism <= 1:
+        for points in batches:
+            _upsert_batch_with_retry(client, collection_name, points, max_retries, wait_result=True)
+        return
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        in_flight = set()
+        for points in batches:
+            if len(in_flight) >= parallelism:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+            in_flight.add(executor.submit(
+                _upsert_batch_with_retry, client, collection_name, points, max_retries, False
+            ))
+
+        for future in in_flight:
+            future.result()
+
+def _upsert_batch_with_retry(
+    client: QdrantClient,
+    collection_name: str,
+    points: List[PointStruct],
+    max_retries: int,
+    wait_result: bool,
+):
+    if not points:
+        return
+
+    for attempt in range(1, max_retries + 1):
+        try:
+            client.upsert(
+                collection_name=collection_name,
+                points=points,
+                wait=wait_result
+            )
+            return
+        except Exception as e:
+            if attempt == max_retries:
+                print(f"배치 업로드 실패 ({collection_name}, {len(points)}건): {e}")
+                raise
+            print(f"배치 업로드 재시도 {attempt}/{max_retries} ({collection_name}): {e}")
+            time.sleep(2 ** (attempt - 1))
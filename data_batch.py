@@ -1,18 +1,20 @@
 import asyncio
 from datetime import datetime, timedelta
-from app.vectordb.client import flush_all_collections
+from app.vectordb.client import cleanup_collections, get_qdrant_client
+from app.vectordb.embedding import get_embedding_model, get_model_load_stats
 from apscheduler.schedulers.blocking import BlockingScheduler
 from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
 
 import os
 import aiohttp
-from app.rdb.client import get_db
+from app.rdb.client import engine, get_db
+from app.rdb.repository import create_activity_event_table
 from app.pipeline.github_pipeline import save_github_data
 from app.pipeline.email_pipeline import save_all_email_data
 from app.pipeline.docs_pipeline import save_docs_data
 from app.pipeline.teams_post_pipeline import save_teams_posts_data
-from app.common.statics_report import save_user_activities_to_rdb
+from app.common.statics_report import save_user_activities_to_rdb_async
 
 
 def get_db_session() -> Session:
@@ -47,6 +49,7 @@ async def run_batch():
         await create_daily_report()
         print("AI API 호출 완료")
 
+        print(f"임베딩 모델 로드 통계: {get_model_load_stats()}")
         print(f"=== 모든 daily 배치 작업 완료: {datetime.now()} ===\n")
     except Exception as e:
         print(f"에러 발생: {e}")
@@ -56,7 +59,7 @@ async def run_batch():
 
 # 토요일 자정에 실행될 작업
 async def run_batch_with_flush():
-    await flush_all_collections()
+    cleanup_collections()
     await run_batch()
     print(f"=== 토요일 배치 작업 완료: {datetime.now()} ===\n")
 
@@ -67,7 +70,7 @@ async def run_user_activity_report():
     date_str = (datetime.now() - timedelta(days=6)).strftime("%Y-%m-%d")
     try:
         print(f"=== 업무 통계 저장 시작: {date_str} ===")
-        save_user_activities_to_rdb(date_str, db)
+        await save_user_activities_to_rdb_async(date_str, db)
         print("=== 업무 통계 저장 완료 ===")
     except Exception as e:
         print(f"save_user_activities_to_rdb 오류 발생: {e}")
@@ -130,7 +133,7 @@ scheduler = BlockingScheduler(timezone=ZoneInfo("Asia/Seoul"))
 # 일~목 자정에는 run_batch만 실행
 scheduler.add_job(lambda: asyncio.run(run_batch()), 'cron', day_of_week='sun,mon,tue,wed,thu', hour=0, minute=0)
 
-# 토요일 자정에는 flush 후 run_batch 실행
+# 토요일 자정에는 VectorDB 정리(보존 기간 정리 또는 flush) 후 run_batch 실행
 scheduler.add_job(lambda: asyncio.run(run_batch_with_flush()), 'cron', day_of_week='sat', hour=0, minute=0)
 
 # 금요일 자정에는 run_batch → 통계 보고까지 함께 실행
@@ -138,5 +141,9 @@ scheduler.add_job(lambda: asyncio.run(run_all_jobs_for_friday()), 'cron', day_of
 
 
 if __name__ == '__main__':
+    # 스케줄러 프로세스에서 임베딩 모델과 Qdrant 클라이언트를 한 번만 생성하여 모든 배치에서 재사용
+    get_embedding_model()
+    get_qdrant_client()
+    create_activity_event_table(engine)
     print("✅ 스케줄러가 시작되었습니다.")
     scheduler.start()
\ No newline at end of file